@@ -2,6 +2,7 @@ import os
 import argparse
 import pydicom
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 
 
 def strip_orientation_metadata(input_path, output_path):
@@ -19,10 +20,12 @@ def strip_orientation_metadata(input_path, output_path):
 
         print(f"Found {len(dcm_files)} DICOM files to process...")
 
-        for filename in dcm_files:
-            input_file = os.path.join(input_path, filename)
-            output_file = os.path.join(output_path, filename)
-            strip_single_file(input_file, output_file)
+        input_files = [os.path.join(input_path, filename) for filename in dcm_files]
+        output_files = [os.path.join(output_path, filename) for filename in dcm_files]
+
+        # Files are independent, so spread them over processes (pydicom parsing holds the GIL)
+        with ProcessPoolExecutor() as executor:
+            list(executor.map(strip_single_file, input_files, output_files, chunksize=64))
 
         print(f"✓ Processed {len(dcm_files)} files")
         print(f"✓ Stripped DICOMs saved to: {output_path}")
@@ -33,22 +36,30 @@ def strip_orientation_metadata(input_path, output_path):
 def strip_single_file(input_file, output_file):
     """Strip metadata from a single DICOM file"""
     try:
-        ds = pydicom.dcmread(input_file)
-
         # Remove orientation metadata tags
         tags_to_remove = [
             'ImageOrientationPatient',
             'ImagePositionPatient',  # Optional: also remove position info
         ]
 
-        removed = []
-        for tag_name in tags_to_remove:
-            if hasattr(ds, tag_name):
+        # Header-only probe: the tags we strip all live before PixelData
+        header = pydicom.dcmread(input_file, stop_before_pixels=True)
+        removed = [tag_name for tag_name in tags_to_remove if hasattr(header, tag_name)]
+
+        in_place = os.path.abspath(input_file) == os.path.abspath(output_file)
+
+        if removed:
+            # Defer large values (PixelData) so save_as streams them from the source
+            # file instead of loading them; not possible when overwriting that file
+            ds = pydicom.dcmread(input_file, defer_size=None if in_place else '16 KB')
+            for tag_name in removed:
                 delattr(ds, tag_name)
-                removed.append(tag_name)
 
-        # Save the modified DICOM
-        ds.save_as(output_file)
+            # Save the modified DICOM
+            ds.save_as(output_file)
+        elif not in_place:
+            # Nothing to strip: copy the bytes instead of decoding and re-encoding the dataset
+            shutil.copyfile(input_file, output_file)
 
         if removed:
             print(f"  {os.path.basename(input_file)}: Removed {', '.join(removed)}")
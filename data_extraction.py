@@ -1,23 +1,87 @@
 import nibabel as nib
 import numpy as np
 import os
+import gzip
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 import imageio.v2 as imageio  # newer imageio versions need .v2 for imwrite
 
+try:
+    import cv2  # much faster PNG encoder than imageio/Pillow
+except ImportError:
+    cv2 = None
 
-def normalize_slice(slice_data):
-    """Normalize a 2D slice to 0–255 (uint8) for saving as an image."""
-    slice_data = np.nan_to_num(slice_data)
-    slice_data = slice_data - slice_data.min()
-    if slice_data.max() != 0:
-        slice_data = slice_data / slice_data.max()
-    return (slice_data * 255).astype(np.uint8)
 
+def normalize_volume(data, axis):
+    """Normalize every 2D slice along `axis` to 0–255 (uint8) in one vectorized pass."""
+    # Per-slice min/max via keepdims reductions over the two in-plane axes
+    in_plane = tuple(a for a in range(data.ndim) if a != axis)
+    lo = data.min(axis=in_plane, keepdims=True).astype(np.float32)
+    hi = data.max(axis=in_plane, keepdims=True).astype(np.float32)
+    rng = hi - lo
+    scale = np.divide(np.float32(255.0), rng, out=np.zeros_like(rng), where=rng > 0)
+    # data may be in its on-disk integer dtype; the float32 working copy is made here
+    vol = np.subtract(data, lo, dtype=np.float32)
+    np.multiply(vol, scale, out=vol)
+    return vol.astype(np.uint8)
 
-def save_slices(nii_path, output_dir):
-    # Load NIfTI volume
-    img = nib.load(nii_path)
-    data = img.get_fdata()
+
+def rotated_stack(vol8, axis):
+    """Return a C-contiguous (N, H, W) stack where stack[i] is np.rot90 of slice i along `axis`."""
+    in_plane = tuple(a for a in range(vol8.ndim) if a != axis)
+    rotated = np.rot90(vol8, axes=in_plane)
+    return np.ascontiguousarray(np.moveaxis(rotated, axis, 0))
+
+
+def load_volume(nii_path, tmp_dir):
+    """
+    Load a NIfTI volume at its on-disk dtype (usually int16).
+
+    Gzipped files are decompressed once into tmp_dir and memory-mapped, since
+    gzip streams are not seekable and every slice read would re-inflate them.
+    """
+    if str(nii_path).endswith(".gz"):
+        raw_path = os.path.join(tmp_dir, Path(nii_path).name[:-3])
+        with gzip.open(nii_path, "rb") as src, open(raw_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        nii_path = raw_path
+
+    img = nib.load(nii_path, mmap=True)
+    data = np.asanyarray(img.dataobj)
+    if np.issubdtype(data.dtype, np.floating):
+        data = np.nan_to_num(data)
+    return data
+
+
+def _write_slice(task, ext="jpg", quality=90):
+    """Write one (image, path) pair; run from the thread pool in save_slices."""
+    slice_img, save_path = task
+    if cv2 is None:
+        if ext == "jpg":
+            imageio.imwrite(save_path, slice_img, quality=quality)
+        else:
+            imageio.imwrite(save_path, slice_img, compress_level=1)
+        return
+    if ext == "jpg":
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    else:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, 1]  # fastest deflate level
+    # OpenCV needs C-contiguous input (no-op for slices from rotated_stack)
+    if not cv2.imwrite(str(save_path), np.ascontiguousarray(slice_img), params):
+        raise IOError(f"Failed to write {save_path}")
+
+
+def save_slices(nii_path, output_dir, ext="jpg", quality=90):
+    """
+    Save axial/coronal/sagittal preview slices of a NIfTI volume.
+
+    ext is "jpg" (lossy, `quality` 0-100) or "png" (lossless, fastest deflate level).
+    """
+    if ext not in ("jpg", "png"):
+        raise ValueError(f"Unsupported image extension: {ext}")
 
     # Ensure output folders exist
     output_dir = Path(output_dir)
@@ -28,25 +92,39 @@ def save_slices(nii_path, output_dir):
     # Get file base name (without extension)
     base_name = Path(nii_path).stem.replace(".nii", "")
 
-    print(f"Loaded {nii_path} with shape {data.shape} (X, Y, Z)")
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        data = load_volume(nii_path, tmp_dir)
+        shape = data.shape
+        print(f"Loaded {nii_path} with shape {shape} (X, Y, Z)")
+
+        # One pre-rotated uint8 stack per view, so every slice handed to the
+        # encoder is already contiguous; none of them reference the memory map
+        vol_axial = rotated_stack(normalize_volume(data, axis=2), axis=2)
+        vol_coronal = rotated_stack(normalize_volume(data, axis=1), axis=1)
+        vol_sagittal = rotated_stack(normalize_volume(data, axis=0), axis=0)
+        del data  # release the memory map before the temp file is removed
+
+    # Collect (rotated slice, path) pairs for all three views, then encode them
+    # in parallel: PNG deflate releases the GIL, so threads scale across cores
+    tasks = []
 
     # Axial view (XY plane, iterate along Z)
-    for i in range(data.shape[2]):
-        slice_img = normalize_slice(data[:, :, i])
-        save_path = output_dir / "axial" / f"{base_name}_axial_{i:03d}.png"
-        imageio.imwrite(save_path, np.rot90(slice_img))
+    for i in range(shape[2]):
+        save_path = output_dir / "axial" / f"{base_name}_axial_{i:03d}.{ext}"
+        tasks.append((vol_axial[i], save_path))
 
     # Coronal view (XZ plane, iterate along Y)
-    for i in range(data.shape[1]):
-        slice_img = normalize_slice(data[:, i, :])
-        save_path = output_dir / "coronal" / f"{base_name}_coronal_{i:03d}.png"
-        imageio.imwrite(save_path, np.rot90(slice_img))
+    for i in range(shape[1]):
+        save_path = output_dir / "coronal" / f"{base_name}_coronal_{i:03d}.{ext}"
+        tasks.append((vol_coronal[i], save_path))
 
     # Sagittal view (YZ plane, iterate along X)
-    for i in range(data.shape[0]):
-        slice_img = normalize_slice(data[i, :, :])
-        save_path = output_dir / "sagittal" / f"{base_name}_sagittal_{i:03d}.png"
-        imageio.imwrite(save_path, np.rot90(slice_img))
+    for i in range(shape[0]):
+        save_path = output_dir / "sagittal" / f"{base_name}_sagittal_{i:03d}.{ext}"
+        tasks.append((vol_sagittal[i], save_path))
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        list(ex.map(partial(_write_slice, ext=ext, quality=quality), tasks))
 
     print(f"✅ Done! Saved slices to {output_dir}/[axial|coronal|sagittal]")
 
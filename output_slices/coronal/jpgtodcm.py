@@ -11,7 +11,8 @@ from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 import pydicom
 from pydicom.dataset import Dataset, FileDataset
-from pydicom.uid import generate_uid, ExplicitVRLittleEndian, SecondaryCaptureImageStorage
+from pydicom.uid import (generate_uid, ExplicitVRLittleEndian, SecondaryCaptureImageStorage,
+                         JPEGLSLossless, RLELossless)
 
 class JPG2DICOMApp(QWidget):
     def __init__(self):
@@ -85,24 +86,16 @@ class JPG2DICOMApp(QWidget):
 
         # Convert PIL image to numpy array
         pil = self.image
-        arr = np.array(pil)
 
         # Determine grayscale or RGB output for DICOM:
         # For simplicity we'll export grayscale (MONOCHROME2) by converting to luminance.
         # If you prefer to keep RGB, the code below can be adapted.
-        if arr.ndim == 3 and arr.shape[2] == 3:
-            # Convert to grayscale using luminance formula
-            gray = (0.299 * arr[..., 0] + 0.587 * arr[..., 1] + 0.114 * arr[..., 2]).astype(np.uint8)
-            pixel_array = gray
-            samples_per_pixel = 1
-            photometric = "MONOCHROME2"
-            planar_configuration = None
-        else:
-            # already single channel
-            pixel_array = arr.astype(np.uint8)
-            samples_per_pixel = 1
-            photometric = "MONOCHROME2"
-            planar_configuration = None
+        # PIL's C-level "L" conversion applies the same 0.299/0.587/0.114 luminance
+        # weights in one pass, and np.asarray wraps its uint8 buffer without a copy.
+        pixel_array = np.asarray(pil.convert("L"))
+        samples_per_pixel = 1
+        photometric = "MONOCHROME2"
+        planar_configuration = None
 
         try:
             self._save_numpy_as_dicom(pixel_array, save_path,
@@ -178,8 +171,21 @@ class JPG2DICOMApp(QWidget):
         ds.is_little_endian = True
         ds.is_implicit_VR = False
 
-        # Save file
-        ds.save_as(out_path, write_like_original=False)
+        # Lossless compression: JPEG-LS when an encoder plugin is installed (pyjpegls),
+        # otherwise RLE, which pydicom can always encode; raw pixels if both fail.
+        # A missing JPEG-LS encoder is the usual case, so only a failed RLE is reported
+        for transfer_syntax in (JPEGLSLossless, RLELossless):
+            try:
+                ds.compress(transfer_syntax, pixel_array)
+                break
+            except (RuntimeError, ValueError) as e:
+                error = e
+        else:
+            print(f"Could not compress losslessly, saving raw pixels: {error}")
+
+        # Save file through a 1 MB buffer so the many small tag writes are coalesced
+        with open(out_path, 'wb', buffering=1 << 20) as f:
+            ds.save_as(f, write_like_original=False)
 
 def main():
     app = QApplication(sys.argv)
@@ -47,6 +47,23 @@ class OrganDetector:
         self.segmentation_mask = None
         self.detected_organs = []
         self.organ_bounds = {}
+        self._mask_views = None  # per-view slice-major copies of segmentation_mask
+        self._overlay_lut = None  # RGB per combined-mask label, built after segmentation
+        self._ts = None  # in-process TotalSegmentator entry point, loaded lazily
+
+    def _load_python_api(self):
+        """
+        Import TotalSegmentator's Python API once and keep it on the instance.
+        Running in-process avoids a fresh interpreter + model load per call.
+        Returns None if the package is not importable.
+        """
+        if self._ts is None:
+            try:
+                from totalsegmentator.python_api import totalsegmentator
+                self._ts = totalsegmentator
+            except ImportError:
+                return None
+        return self._ts
 
     def check_gpu_availability(self) -> Tuple[bool, str]:
         """
@@ -93,6 +110,8 @@ class OrganDetector:
 
     def check_totalsegmentator_installed(self) -> bool:
         """Check if TotalSegmentator is installed."""
+        if self._load_python_api() is not None:
+            return True
         try:
             result = subprocess.run(['TotalSegmentator', '--version'],
                                     capture_output=True, text=True, timeout=5)
@@ -143,10 +162,6 @@ class OrganDetector:
         if not self.check_totalsegmentator_installed():
             return False, "TotalSegmentator not installed. Please install it first.", None
 
-        # ... rest of your existing code ...
-        if not self.check_totalsegmentator_installed():
-            return False, "TotalSegmentator not installed. Please install it first.", None
-
         # Create temporary files
         with tempfile.TemporaryDirectory() as temp_dir:
             input_path = os.path.join(temp_dir, 'input.nii.gz')
@@ -157,46 +172,43 @@ class OrganDetector:
                 # Save input image
                 sitk.WriteImage(sitk_image, input_path)
 
-                # Build command
-                cmd = ['TotalSegmentator', '-i', input_path, '-o', output_dir]
+                gpu_status = "GPU" if gpu_available else "CPU"
+                device = 'gpu' if gpu_available else 'cpu'
 
-                if fast:
-                    cmd.append('--fast')
+                # Time the segmentation run
+                import time
+                start_time = time.time()
 
-                # ADD THIS BLOCK:
-                # Force device selection
-                gpu_available, _ = self.check_gpu_availability()
-                if gpu_available:
-                    cmd.extend(['--device', 'gpu'])
-                    print("[INFO] Forcing GPU usage with --device gpu flag")
+                totalsegmentator = self._load_python_api()
+                if totalsegmentator is not None:
+                    # Run segmentation in-process
+                    print(f"[INFO] Running TotalSegmentator in-process on {gpu_status}")
+                    totalsegmentator(input_path, output_dir, fast=fast, device=device,
+                                     roi_subset=roi_subset, quiet=True)
                 else:
-                    cmd.extend(['--device', 'cpu'])
-                    print("[INFO] Using CPU (no GPU available)")
+                    # Build command (CLI fallback when the Python API cannot be imported)
+                    cmd = ['TotalSegmentator', '-i', input_path, '-o', output_dir]
 
-                if roi_subset:
-                    cmd.extend(['--roi_subset'] + roi_subset)
+                    if fast:
+                        cmd.append('--fast')
 
-                # ADD THIS BEFORE subprocess.run:
-                import time
-                start_time = time.time()
+                    # Force device selection
+                    cmd.extend(['--device', device])
 
-                # Run segmentation
-                print(f"[INFO] Running TotalSegmentator: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=900)
+                    if roi_subset:
+                        cmd.extend(['--roi_subset'] + roi_subset)
+
+                    # Run segmentation
+                    print(f"[INFO] Running TotalSegmentator: {' '.join(cmd)}")
+                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=900)  # 15 minutes
+
+                    if result.returncode != 0:
+                        return False, f"Segmentation failed: {result.stderr}", None
 
-                # ADD THIS AFTER subprocess.run:
                 elapsed_time = time.time() - start_time
                 print(
                     f"[TIMING] Segmentation completed in {elapsed_time:.1f} seconds ({elapsed_time / 60:.1f} minutes)")
 
-                # Run segmentation
-                print(f"[CMD] Running: {' '.join(cmd)}")
-                print(f"Running TotalSegmentator: {' '.join(cmd)}")
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=900)  # 15 minutes
-
-                if result.returncode != 0:
-                    return False, f"Segmentation failed: {result.stderr}", None
-
                 # Load segmentation results
                 segmentation_files = [f for f in os.listdir(output_dir) if f.endswith('.nii.gz')]
 
@@ -214,32 +226,39 @@ class OrganDetector:
                     seg_image = sitk.ReadImage(seg_path)
                     seg_array = sitk.GetArrayFromImage(seg_image)
 
-                    if np.any(seg_array > 0):
-                        self.detected_organs.append(organ_name)
-
-                        # Calculate bounding box
-                        indices = np.where(seg_array > 0)
-                        if len(indices[0]) > 0:
-                            self.organ_bounds[organ_name] = {
-                                'z_min': int(np.min(indices[0])),
-                                'z_max': int(np.max(indices[0])),
-                                'y_min': int(np.min(indices[1])),
-                                'y_max': int(np.max(indices[1])),
-                                'x_min': int(np.min(indices[2])),
-                                'x_max': int(np.max(indices[2])),
-                                'volume_voxels': int(np.sum(seg_array > 0))
-                            }
-
-                        # Combine masks (assign unique label to each organ)
-                        if combined_mask is None:
-                            combined_mask = np.zeros_like(seg_array, dtype=np.uint8)
-
-                        organ_id = len(self.detected_organs)
-                        combined_mask[seg_array > 0] = organ_id
+                    # Single scan for the voxel indices; bounds, volume and the
+                    # combined-mask write all reuse them (masks are 0/1 labels)
+                    indices = np.nonzero(seg_array)
+                    if indices[0].size == 0:
+                        continue
+
+                    self.detected_organs.append(organ_name)
+
+                    # Calculate bounding box
+                    z_idx, y_idx, x_idx = indices
+                    self.organ_bounds[organ_name] = {
+                        'z_min': int(z_idx.min()),
+                        'z_max': int(z_idx.max()),
+                        'y_min': int(y_idx.min()),
+                        'y_max': int(y_idx.max()),
+                        'x_min': int(x_idx.min()),
+                        'x_max': int(x_idx.max()),
+                        'volume_voxels': int(z_idx.size)
+                    }
+
+                    # Combine masks (assign unique label to each organ)
+                    if combined_mask is None:
+                        combined_mask = np.zeros_like(seg_array, dtype=np.uint8)
+
+                    organ_id = len(self.detected_organs)
+                    combined_mask[indices] = organ_id
 
                 self.segmentation_mask = combined_mask
+                self._mask_views = None
+                if combined_mask is not None:
+                    self._build_mask_views()
+                self._build_overlay_lut()
 
-                gpu_status = "GPU" if gpu_available else "CPU"
                 message = f"Successfully detected {len(self.detected_organs)} organs in {elapsed_time:.1f}s using {gpu_status}: {', '.join(self.detected_organs)}"
                 return True, message, combined_mask
 
@@ -276,37 +295,48 @@ class OrganDetector:
         if self.segmentation_mask is None:
             return None
 
-        # Extract slice based on view
-        if view == 'axial':
-            mask_slice = self.segmentation_mask[slice_index, :, :]
-        elif view == 'coronal':
-            mask_slice = self.segmentation_mask[:, slice_index, :]
-        elif view == 'sagittal':
-            mask_slice = self.segmentation_mask[:, :, slice_index]
-        else:
+        # Extract slice based on view (from the slice-major copy, so it is contiguous)
+        if self._mask_views is None:
+            self._build_mask_views()
+        if view not in self._mask_views:
             return None
+        mask_slice = self._mask_views[view][slice_index]
 
-        # Create RGBA overlay
-        overlay = np.zeros((*mask_slice.shape, 4), dtype=np.float32)
+        # Create RGBA overlay with one gather through the per-label color table
+        if self._overlay_lut is None:
+            self._build_overlay_lut()
+        lut = np.empty((len(self._overlay_lut), 4), dtype=np.float32)
+        lut[:, :3] = self._overlay_lut
+        lut[:, 3] = alpha
+        lut[0] = 0.0  # background stays fully transparent
 
-        # Color each organ
-        for idx, organ_name in enumerate(self.detected_organs, start=1):
-            mask = mask_slice == idx
-            if np.any(mask):
-                # Use predefined color or generate one
-                if organ_name in self.ORGAN_INFO:
-                    color = self.ORGAN_INFO[organ_name]['color']
-                else:
-                    # Generate color based on organ index
-                    color = plt.cm.tab20(idx % 20)[:3]
-                    color = tuple(int(c * 255) for c in color)
-
-                overlay[mask, 0] = color[0] / 255.0
-                overlay[mask, 1] = color[1] / 255.0
-                overlay[mask, 2] = color[2] / 255.0
-                overlay[mask, 3] = alpha
+        return lut[mask_slice]
 
-        return overlay
+    def _build_mask_views(self):
+        """
+        Cache one C-contiguous copy of the mask per view, laid out so that
+        view[slice_index] is a unit-stride 2D slice (about 3x mask memory).
+        """
+        mask = self.segmentation_mask
+        self._mask_views = {
+            'axial': mask,                                              # [Z, Y, X]
+            'coronal': np.ascontiguousarray(mask.transpose(1, 0, 2)),   # [Y, Z, X]
+            'sagittal': np.ascontiguousarray(mask.transpose(2, 0, 1)),  # [X, Z, Y]
+        }
+
+    def _build_overlay_lut(self):
+        """Build the (n_labels + 1, 3) RGB color table indexed by combined-mask label."""
+        lut = np.zeros((len(self.detected_organs) + 1, 3), dtype=np.float32)
+        for idx, organ_name in enumerate(self.detected_organs, start=1):
+            # Use predefined color or generate one
+            if organ_name in self.ORGAN_INFO:
+                color = self.ORGAN_INFO[organ_name]['color']
+            else:
+                # Generate color based on organ index
+                color = plt.cm.tab20(idx % 20)[:3]
+                color = tuple(int(c * 255) for c in color)
+            lut[idx] = np.array(color, dtype=np.float32) / 255.0
+        self._overlay_lut = lut
 
     def get_organ_statistics(self) -> Dict:
         """Get statistics about detected organs."""
@@ -1,29 +1,299 @@
 import sys
 import logging
-from functools import wraps
+from collections import OrderedDict
+from functools import wraps, partial, lru_cache
 from typing import Optional, Tuple, Any
 import SimpleITK as sitk
 import numpy as np
 from PyQt5.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton,
                              QWidget, QFileDialog, QSlider, QStatusBar, QGroupBox, QLabel,
                              QComboBox, QMessageBox, QRadioButton, QButtonGroup, QCheckBox,
-                             QSpinBox, QDoubleSpinBox, QScrollArea)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QCursor, QPalette, QColor
+                             QSpinBox, QDoubleSpinBox, QScrollArea, QProgressBar)
+from PyQt5.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPalette, QColor
 import matplotlib
 
 matplotlib.use('Qt5Agg')
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox, TransformedBbox
 import matplotlib.pyplot as plt
 import pydicom
 import os
-from scipy.ndimage import rotate, zoom  # Removed binary_fill_holes
+from scipy.ndimage import rotate  # Removed binary_fill_holes
 from skimage import measure  # Required for draw_surface_outline
-from detect_orientation import predict_dicom_image
+from detect_orientation import predict_dicom_image, IMAGE_SIZE
 from detect_organ import OrganDetector
 
-
-
+try:
+    import nibabel as nib  # Memory-maps uncompressed NIfTI volumes
+except ImportError:
+    nib = None
+
+try:
+    import cv2  # optional: C contour tracing for the segmentation outline
+except ImportError:
+    cv2 = None
+
+try:
+    import cupy as cp  # optional: oblique plane sampling on a CUDA GPU
+    from cupyx.scipy.ndimage import map_coordinates
+except ImportError:
+    cp = None
+
+try:
+    from numba import njit, prange  # optional: fused window + colormap kernel
+except ImportError:
+    njit = None
+
+# Below this size a NIfTI file is simply read into RAM; mapping it buys nothing
+NIFTI_MMAP_MIN_BYTES = 64 * 1024 * 1024
+
+# Windowed uint8 slices kept for back-scrolling (a 512x512 slice is 256 KB)
+SLICE_CACHE_SIZE = 256
+
+# Display levels per slice: windowed slices are quantized to uint8 LUT indices
+DISPLAY_LEVELS = 256
+
+# Largest scan that also gets contiguous coronal/sagittal copies (2x its size)
+VIEW_STACK_MAX_BYTES = 1024 * 1024 * 1024
+
+# Largest scan whose three views are also kept pre-windowed as uint8 levels (1 B/voxel each)
+LEVEL_STACK_MAX_BYTES = 1024 * 1024 * 1024
+
+# Oblique volume resampled at 1/N resolution (nearest neighbour) while an angle is dragged
+OBLIQUE_PREVIEW_FACTOR = 4
+
+# Per view: scan axis along the plot's x, scan axis along its y, and whether plot y runs
+# against that axis (coronal/sagittal show z flipped); order is (axial, coronal, sagittal)
+ROI_VIEW_AXES = ((2, 1, False), (2, 0, True), (1, 0, True))
+
+# Arrow key -> pan direction; the step is scaled by keyPressEvent
+PAN_KEYS = {Qt.Key_Left: (-1, 0), Qt.Key_Right: (1, 0), Qt.Key_Up: (0, -1), Qt.Key_Down: (0, 1)}
+
+# Application-wide dark theme, parsed by Qt once when the viewer applies it
+MRI_DARK_STYLE = """
+    QWidget {
+        background-color: #1e1e1e;
+        color: #e0e0e0;
+        font-family: 'Segoe UI', Arial, sans-serif;
+        font-size: 9pt;
+    }
+    QGroupBox {
+        border: 1px solid #404040;
+        border-radius: 6px;
+        margin-top: 12px;
+        padding-top: 15px;
+        font-weight: bold;
+        color: #00adb5;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+    QPushButton {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 4px;
+        padding: 6px 12px;
+        color: #e0e0e0;
+    }
+    QPushButton:hover {
+        background-color: #3e3e42;
+        border: 1px solid #00adb5;
+    }
+    QPushButton:pressed {
+        background-color: #007acc;
+    }
+    QPushButton:checked {
+        background-color: #00adb5;
+        color: #1e1e1e;
+    }
+    QPushButton:disabled {
+        background-color: #252526;
+        color: #6e6e6e;
+        border: 1px solid #2d2d30;
+    }
+    QComboBox {
+        background-color: #2d2d30;
+        border: 1px solid #3e3e42;
+        border-radius: 4px;
+        padding: 4px;
+    }
+    QComboBox:hover {
+        border: 1px solid #00adb5;
+    }
+    QComboBox::drop-down {
+        border: none;
+    }
+    QSlider::groove:horizontal {
+        background: #3e3e42;
+        height: 6px;
+        border-radius: 3px;
+    }
+    QSlider::handle:horizontal {
+        background: #00adb5;
+        width: 14px;
+        margin: -4px 0;
+        border-radius: 7px;
+    }
+    QSlider::handle:horizontal:hover {
+        background: #00d4dd;
+    }
+    QRadioButton {
+        spacing: 8px;
+    }
+    QRadioButton::indicator {
+        width: 16px;
+        height: 16px;
+        border-radius: 8px;
+        border: 2px solid #3e3e42;
+    }
+    QRadioButton::indicator:checked {
+        background-color: #00adb5;
+        border: 2px solid #00adb5;
+    }
+    QStatusBar {
+        background-color: #252526;
+        color: #e0e0e0;
+        border-top: 1px solid #3e3e42;
+    }
+    QLabel {
+        color: #e0e0e0;
+    }
+    QScrollArea {
+        border: none;
+        background-color: #1e1e1e;
+    }
+    QScrollBar:vertical {
+        background: #2d2d30;
+        width: 12px;
+        border-radius: 6px;
+        margin: 0px;
+    }
+    QScrollBar::handle:vertical {
+        background: #00adb5;
+        border-radius: 6px;
+        min-height: 20px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: #00d4dd;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
+        background: none;
+    }
+"""
+
+# Tags needed to decode PixelData (the file meta transfer syntax is always read)
+DICOM_PIXEL_TAGS = ['Rows', 'Columns', 'SamplesPerPixel', 'PhotometricInterpretation',
+                    'PlanarConfiguration', 'BitsAllocated', 'BitsStored', 'HighBit',
+                    'PixelRepresentation', 'NumberOfFrames', 'PixelData']
+
+# Minimum time between two renders of a view while its slider is dragged (~60 fps)
+SLIDER_FRAME_MS = 16
+
+# Quiet time after the last crosshair or window change before the oblique plane is resampled
+OBLIQUE_SETTLE_MS = 50
+
+
+@lru_cache(maxsize=None)
+def colormap_lut(name):
+    """DISPLAY_LEVELS-entry colormap LUT with each RGBA uint8 color packed into one uint32"""
+    cmap = matplotlib.colormaps[name]
+    if cmap.N != DISPLAY_LEVELS:
+        cmap = cmap.resampled(DISPLAY_LEVELS)
+    return cmap(np.arange(DISPLAY_LEVELS), bytes=True).view(np.uint32).ravel()
+
+
+def apply_lut(levels, lut):
+    """Map a uint8 level image through a packed LUT to an RGBA uint8 image"""
+    return np.take(lut, levels).view(np.uint8).reshape(levels.shape + (4,))
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _window_levels(slice_data, gain, offset, out):
+        # Window, normalize and quantize each pixel in one streaming pass over the slice
+        top = DISPLAY_LEVELS - 1
+        for i in prange(slice_data.shape[0]):
+            for j in range(slice_data.shape[1]):
+                t = slice_data[i, j] * gain + offset
+                out[i, j] = top if t >= top else (int(t) if t > 0 else 0)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _window_rgba(slice_data, gain, offset, lut, out):
+        # _window_levels fused with the colormap gather: each pixel goes straight to its
+        # packed RGBA value, with no intermediate level image
+        top = DISPLAY_LEVELS - 1
+        for i in prange(slice_data.shape[0]):
+            for j in range(slice_data.shape[1]):
+                t = slice_data[i, j] * gain + offset
+                out[i, j] = lut[top if t >= top else (int(t) if t > 0 else 0)]
+
+    @njit(parallel=True, cache=True)
+    def _threshold_labels(labels, mask, occupied_z, occupied_y, occupied_x):
+        # Foreground mask and per-axis "slice has labels" flags in one pass over the volume;
+        # concurrent writes to the flags only ever store True
+        for z in prange(labels.shape[0]):
+            for y in range(labels.shape[1]):
+                for x in range(labels.shape[2]):
+                    if labels[z, y, x] > 0:
+                        mask[z, y, x] = True
+                        occupied_z[z] = True
+                        occupied_y[y] = True
+                        occupied_x[x] = True
+
+    @njit(parallel=True, cache=True)
+    def _mask_boundary(mask, out):
+        # A foreground pixel is on the boundary if a 4-neighbour is background or off the slice
+        height, width = mask.shape
+        for i in prange(height):
+            for j in range(width):
+                if mask[i, j]:
+                    out[i, j] = (i == 0 or j == 0 or i == height - 1 or j == width - 1
+                                 or not (mask[i - 1, j] and mask[i + 1, j]
+                                         and mask[i, j - 1] and mask[i, j + 1]))
+
+
+class SliceImage(AxesImage):
+    """AxesImage for colormapped RGBA uint8 slices, scaled to the screen by nearest-neighbour
+    gather instead of Matplotlib's general (masked, filtered) resampling pipeline"""
+
+    def make_image(self, renderer, magnification=1.0, unsampled=False):
+        data = np.asarray(self.get_array())
+        if unsampled or magnification != 1.0 or self.origin != 'upper' or data.dtype != np.uint8:
+            return super().make_image(renderer, magnification, unsampled)
+
+        trans = self.get_transform()
+        left, right, bottom, top = self.get_extent()
+        image_box = TransformedBbox(Bbox([[left, bottom], [right, top]]), trans)
+        clipped = Bbox.intersection(image_box, self.get_clip_box() or self.axes.bbox)
+        if clipped is None:
+            return None, 0, 0, None
+        # Output pixel bounds rounded the same way AxesImage rounds them
+        x0, y0 = np.floor(clipped.x0 + 0.5), np.ceil(clipped.y0 - 0.5 - 1e-8)
+        x1, y1 = np.floor(clipped.x1 + 0.5 + 1e-8), np.ceil(clipped.y1 - 0.5)
+        if x1 <= x0 or y1 <= y0:
+            return None, 0, 0, None
+
+        # Source column/row under each output pixel centre; rows run bottom-up for Agg
+        xs, ys = np.arange(x0, x1) + 0.5, np.arange(y0, y1) + 0.5
+        inverse = trans.inverted()
+        data_x = inverse.transform(np.column_stack([xs, np.full(len(xs), ys[0])]))[:, 0]
+        data_y = inverse.transform(np.column_stack([np.full(len(ys), xs[0]), ys]))[:, 1]
+        height, width = data.shape[:2]
+        cols = np.clip(((data_x - left) * (width / (right - left))).astype(np.intp), 0, width - 1)
+        rows = np.clip(((data_y - top) * (height / (bottom - top))).astype(np.intp), 0, height - 1)
+
+        # Two gathers of packed uint32 pixels, one per axis
+        packed = np.ascontiguousarray(data).view(np.uint32).reshape(height, width)
+        output = np.take(packed[rows], cols, axis=1)
+        return output.view(np.uint8).reshape(output.shape + (4,)), x0, y0, None
 
 
 # ============================================================================
@@ -114,6 +384,35 @@ def validate_array(func):
     return wrapper
 
 
+# ============================================================================
+# BACKGROUND LOADING
+# ============================================================================
+
+class LoadSignals(QObject):
+    """Signals a LoadTask uses to hand results back to the GUI thread"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(int)
+
+
+class LoadTask(QRunnable):
+    """Run a blocking read function on the global thread pool"""
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            result = self.func(*self.args, progress=self.signals.progress.emit)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
 # ============================================================================
 # MAIN MRI VIEWER CLASS
 # ============================================================================
@@ -130,8 +429,32 @@ class MRIViewer(QWidget):
         self.data = None
         self.scan_array = None
         self.sitk_image = None
+        self._sitk_image_path = None
         self.segmentation_array = None
         self.current_scan_path = None
+        # Sorted files of the loaded DICOM series (or the single file) and the last
+        # orientation prediction as (dicom_file, predicted_class, confidence)
+        self.dicom_series_files = None
+        self.orientation_result = None
+        # Scan re-laid out as (y, z, x) and (x, z, y), z flipped for display, so each
+        # coronal/sagittal slice is one contiguous block already in screen orientation
+        self.coronal_stack = None
+        self.sagittal_stack = None
+        # Per-view (min, max) arrays over slice index, used as each slice's display range
+        self.slice_ranges = None
+        # Per view, (brightness, contrast, levels): every slice windowed to uint8 levels at
+        # that window, so scrolling a view at it is a pure index
+        self.level_stacks = [None, None, None]
+
+        # Segmentation outline: foreground mask, its per-view display-oriented slice stacks,
+        # per-axis "slice has labels" flags and the largest contour of each (view, slice)
+        # already traced
+        self.seg_mask = None
+        self.seg_views = None
+        self.seg_occupied = None
+        # Voxel count per label value (index = label) for small unsigned label maps
+        self.label_counts = None
+        self.outline_cache = {}
 
         # Slice positions
         self.slices = [0, 0, 0]
@@ -146,6 +469,8 @@ class MRIViewer(QWidget):
         # Brightness/Contrast
         self.brightness = [0, 0, 0]
         self.contrast = [1.0, 1.0, 1.0]
+        # One window/level for all three views (they show the same volume)
+        self.global_window_level = True
         self.adjusting_window = False
         self.last_mouse_pos = None
 
@@ -156,9 +481,24 @@ class MRIViewer(QWidget):
         # View states
         self.panning = False
         self.pan_start = None
+        # View whose canvas is under the mouse (target of arrow-key panning), or None
+        self.hovered_view = None
         self.current_colormap = 'gray'
+        # Rendered RGBA slices keyed by (view, slice, brightness, contrast, colormap)
+        self.slice_cache = OrderedDict()
         self.cine_running = False
         self.oblique_enabled = False
+        # Oblique resampling: the filter and transform are built once per scan and set up
+        # again only when the angles or the crosshair move; only the shown plane is resampled
+        # and kept, keyed by (oblique_key, slice)
+        self.oblique_resampler = None
+        self.oblique_transform = None
+        self.oblique_key = None
+        self.oblique_plane = None
+        self.oblique_plane_key = None
+        # Scan uploaded to the GPU on first oblique use when CuPy is available; False once
+        # the GPU has run out of memory for it
+        self.scan_gpu = None
         # highlight-start
         self.outline_enabled = False  # New state for simple outline toggle
         # highlight-end
@@ -200,121 +540,7 @@ class MRIViewer(QWidget):
             self.setGeometry(100, 100, 1600, 900)
 
             # Apply modern styling
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #1e1e1e;
-                    color: #e0e0e0;
-                    font-family: 'Segoe UI', Arial, sans-serif;
-                    font-size: 9pt;
-                }
-                QGroupBox {
-                    border: 1px solid #404040;
-                    border-radius: 6px;
-                    margin-top: 12px;
-                    padding-top: 15px;
-                    font-weight: bold;
-                    color: #00adb5;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 5px;
-                }
-                QPushButton {
-                    background-color: #2d2d30;
-                    border: 1px solid #3e3e42;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    color: #e0e0e0;
-                }
-                QPushButton:hover {
-                    background-color: #3e3e42;
-                    border: 1px solid #00adb5;
-                }
-                QPushButton:pressed {
-                    background-color: #007acc;
-                }
-                QPushButton:checked {
-                    background-color: #00adb5;
-                    color: #1e1e1e;
-                }
-                QPushButton:disabled {
-                    background-color: #252526;
-                    color: #6e6e6e;
-                    border: 1px solid #2d2d30;
-                }
-                QComboBox {
-                    background-color: #2d2d30;
-                    border: 1px solid #3e3e42;
-                    border-radius: 4px;
-                    padding: 4px;
-                }
-                QComboBox:hover {
-                    border: 1px solid #00adb5;
-                }
-                QComboBox::drop-down {
-                    border: none;
-                }
-                QSlider::groove:horizontal {
-                    background: #3e3e42;
-                    height: 6px;
-                    border-radius: 3px;
-                }
-                QSlider::handle:horizontal {
-                    background: #00adb5;
-                    width: 14px;
-                    margin: -4px 0;
-                    border-radius: 7px;
-                }
-                QSlider::handle:horizontal:hover {
-                    background: #00d4dd;
-                }
-                QRadioButton {
-                    spacing: 8px;
-                }
-                QRadioButton::indicator {
-                    width: 16px;
-                    height: 16px;
-                    border-radius: 8px;
-                    border: 2px solid #3e3e42;
-                }
-                QRadioButton::indicator:checked {
-                    background-color: #00adb5;
-                    border: 2px solid #00adb5;
-                }
-                QStatusBar {
-                    background-color: #252526;
-                    color: #e0e0e0;
-                    border-top: 1px solid #3e3e42;
-                }
-                QLabel {
-                    color: #e0e0e0;
-                }
-                 QScrollArea {
-                    border: none;
-                    background-color: #1e1e1e;
-                }
-                QScrollBar:vertical {
-                    background: #2d2d30;
-                    width: 12px;
-                    border-radius: 6px;
-                    margin: 0px;
-                }
-                QScrollBar::handle:vertical {
-                    background: #00adb5;
-                    border-radius: 6px;
-                    min-height: 20px;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background: #00d4dd;
-                }
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                    height: 0px;
-                }
-                QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
-                    background: none;
-                }
-            """)
+            self.setStyleSheet(MRI_DARK_STYLE)
 
             self.main_layout = QHBoxLayout()
             self.create_control_panel()
@@ -327,6 +553,19 @@ class MRIViewer(QWidget):
             self.playback_timer.timeout.connect(self.update_slices)
             self.is_playing = False
 
+            self.window_pending = set()
+            self.window_timer = QTimer(self)
+            self.window_timer.setSingleShot(True)
+            self.window_timer.setInterval(0)
+            self.window_timer.timeout.connect(self.flush_window_update)
+
+            # Restarted by every crosshair/window change, so a drag resamples the oblique
+            # plane once it settles instead of on every step
+            self.oblique_timer = QTimer(self)
+            self.oblique_timer.setSingleShot(True)
+            self.oblique_timer.setInterval(OBLIQUE_SETTLE_MS)
+            self.oblique_timer.timeout.connect(self.show_oblique_view)
+
             self.setLayout(self.main_layout)
             self.setFocusPolicy(Qt.StrongFocus)
 
@@ -455,6 +694,11 @@ class MRIViewer(QWidget):
         self.colormap_combo.currentTextChanged.connect(self.update_colormap)
         controls_layout.addWidget(self.colormap_combo)
 
+        self.link_window_checkbox = QCheckBox("Link window/level across views")
+        self.link_window_checkbox.setChecked(self.global_window_level)
+        self.link_window_checkbox.toggled.connect(self.toggle_global_window_level)
+        controls_layout.addWidget(self.link_window_checkbox)
+
         self.reset_button = QPushButton("🔄 Reset View")
         self.reset_button.clicked.connect(self.reset_view)
         controls_layout.addWidget(self.reset_button)
@@ -471,14 +715,15 @@ class MRIViewer(QWidget):
         self.oblique_angle_x_slider = QSlider(Qt.Horizontal)
         self.oblique_angle_x_slider.setRange(-180, 180)
         self.oblique_angle_x_slider.setValue(30)
-        self.oblique_angle_x_slider.valueChanged.connect(lambda _: self.show_oblique_view())
+        # Dragging an angle shows a coarse preview; releasing resamples at full resolution
+        self.throttle_slider(self.oblique_angle_x_slider, lambda _: self.show_oblique_view())
         angle_layout.addWidget(self.oblique_angle_x_slider)
 
         angle_layout.addWidget(QLabel("Oblique Angle Y (degrees)"))
         self.oblique_angle_y_slider = QSlider(Qt.Horizontal)
         self.oblique_angle_y_slider.setRange(-180, 180)
         self.oblique_angle_y_slider.setValue(45)
-        self.oblique_angle_y_slider.valueChanged.connect(lambda _: self.show_oblique_view())
+        self.throttle_slider(self.oblique_angle_y_slider, lambda _: self.show_oblique_view())
         angle_layout.addWidget(self.oblique_angle_y_slider)
         self.control_layout.addLayout(angle_layout)
 
@@ -490,6 +735,11 @@ class MRIViewer(QWidget):
         # Status bar at bottom
         self.status_bar = QStatusBar()
         self.status_bar.showMessage("Ready to load scan data...", 3000)
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setMaximumWidth(150)
+        self.load_progress.hide()
+        self.status_bar.addPermanentWidget(self.load_progress)
         self.control_layout.addWidget(self.status_bar)
 
     def create_viewport_panel(self):
@@ -498,9 +748,14 @@ class MRIViewer(QWidget):
         self.viewport_layout = QVBoxLayout()
         self.viewport_panel.setLayout(self.viewport_layout)
 
-        self.axial_fig, self.axial_ax = plt.subplots(facecolor='#2b2b2b')
-        self.coronal_fig, self.coronal_ax = plt.subplots(facecolor='#2b2b2b')
-        self.sagittal_fig, self.sagittal_ax = plt.subplots(facecolor='#2b2b2b')
+        # Plain Figures: pyplot would also build a figure manager with its own (hidden)
+        # window and canvas for each one, on top of the canvas embedded below
+        self.axial_fig = Figure(facecolor='#2b2b2b')
+        self.coronal_fig = Figure(facecolor='#2b2b2b')
+        self.sagittal_fig = Figure(facecolor='#2b2b2b')
+        self.axial_ax = self.axial_fig.add_subplot()
+        self.coronal_ax = self.coronal_fig.add_subplot()
+        self.sagittal_ax = self.sagittal_fig.add_subplot()
 
         for fig in [self.axial_fig, self.coronal_fig, self.sagittal_fig]:
             fig.patch.set_facecolor('#2b2b2b')
@@ -511,18 +766,23 @@ class MRIViewer(QWidget):
         self.sagittal_canvas = FigureCanvas(self.sagittal_fig)
 
         for canvas, idx in [(self.axial_canvas, 0), (self.coronal_canvas, 1), (self.sagittal_canvas, 2)]:
+            self.setup_canvas_painting(canvas)
             canvas.mpl_connect('scroll_event', lambda event, i=idx: self.wheel_zoom(event, i))
             canvas.mpl_connect('button_press_event', lambda event, i=idx: self.on_press(event, i))
             canvas.mpl_connect('motion_notify_event', lambda event, i=idx: self.on_motion(event, i))
             canvas.mpl_connect('button_release_event', lambda event, i=idx: self.on_release(event, i))
+            canvas.mpl_connect('draw_event', lambda event: self.on_canvas_draw(event.canvas.figure.axes[0]))
+            canvas.mpl_connect('figure_enter_event', lambda event, i=idx: setattr(self, 'hovered_view', i))
+            canvas.mpl_connect('figure_leave_event', lambda event, i=idx: self.on_canvas_leave(i))
 
         self.axial_slider = QSlider(Qt.Horizontal)
         self.coronal_slider = QSlider(Qt.Horizontal)
         self.sagittal_slider = QSlider(Qt.Horizontal)
 
-        self.axial_slider.valueChanged.connect(self.update_axial_slice)
-        self.coronal_slider.valueChanged.connect(self.update_coronal_slice)
-        self.sagittal_slider.valueChanged.connect(self.update_sagittal_slice)
+        # Frames drawn mid-drag may be downsampled; release redraws at full resolution
+        self.throttle_slider(self.axial_slider, self.update_axial_slice)
+        self.throttle_slider(self.coronal_slider, self.update_coronal_slice)
+        self.throttle_slider(self.sagittal_slider, self.update_sagittal_slice)
 
         self.grid_layout = QGridLayout()
         self.axial_group = self.create_viewport_group("⬆ Axial View", self.axial_canvas, self.axial_slider)
@@ -535,6 +795,23 @@ class MRIViewer(QWidget):
 
         self.viewport_layout.addLayout(self.grid_layout)
 
+    @staticmethod
+    def setup_canvas_painting(canvas):
+        """Let Qt skip its own background fill: the Agg canvas repaints every pixel itself"""
+        canvas.setAttribute(Qt.WA_OpaquePaintEvent)
+        canvas.setAttribute(Qt.WA_NoSystemBackground)
+
+    def throttle_slider(self, slider, update):
+        """Call update(value) at most once per SLIDER_FRAME_MS while the slider moves, always
+        with its latest value, and once more when it is released"""
+        # A drag emits valueChanged for every step; a single-shot timer coalesces them
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(SLIDER_FRAME_MS)
+        timer.timeout.connect(lambda: update(slider.value()))
+        slider.valueChanged.connect(lambda _: timer.isActive() or timer.start())
+        slider.sliderReleased.connect(lambda: update(slider.value()))
+
     def create_viewport_group(self, title, canvas, slider):
         """Create a group box containing viewport and slider"""
         group = QGroupBox(title)
@@ -556,10 +833,57 @@ class MRIViewer(QWidget):
     # Removed update_segmentation_opacity
     # highlight-end
 
+    @property
+    def sitk_image(self):
+        """SimpleITK image of the scan, read from disk on first use for memory-mapped NIfTI"""
+        if self._sitk_image is None and self._sitk_image_path is not None:
+            self._sitk_image = sitk.ReadImage(self._sitk_image_path)
+            self._sitk_image_path = None
+        return self._sitk_image
+
+    @sitk_image.setter
+    def sitk_image(self, image):
+        self._sitk_image = image
+        self._sitk_image_path = None
+
     # ========================================================================
     # FILE LOADING METHODS (WITH IMPROVED ERROR HANDLING)
     # ========================================================================
 
+    def run_load_task(self, func, on_finished, *args):
+        """Read on the thread pool with the load buttons disabled; on_finished gets the result"""
+        self.set_loading(True)
+        task = LoadTask(func, *args)
+        task.signals.progress.connect(self.load_progress.setValue)
+        # Slots run in connection order, so the buttons are back before on_finished runs
+        task.signals.finished.connect(lambda result: self.set_loading(False))
+        task.signals.failed.connect(lambda error: self.set_loading(False))
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(self.on_load_failed)
+        self.load_task = task  # Keep the signals alive until the task reports back
+        QThreadPool.globalInstance().start(task)
+
+    def set_loading(self, busy):
+        """Disable the load buttons and show the progress bar while a file is being read"""
+        for button in (self.load_nifti_button, self.load_dicom_button,
+                       self.load_dicom_file_button, self.load_segmentation_button):
+            button.setEnabled(not busy)
+        if busy:
+            self.load_progress.setValue(0)
+            self.load_progress.show()
+        else:
+            self.load_progress.hide()
+            self.load_segmentation_button.setEnabled(self.scan_array is not None)
+
+    def on_load_failed(self, error):
+        ErrorHandler.handle_error(error, "Error loading file", "error", True, self)
+        self.status_bar.showMessage(f"❌ Loading failed: {error}", 5000)
+
+    @staticmethod
+    def track_progress(process, progress):
+        """Forward a SimpleITK process object's progress events as 0-100 values"""
+        process.AddCommand(sitk.sitkProgressEvent, lambda: progress(int(100 * process.GetProgress())))
+
     @safe_execute(show_error=True)
     def load_nifti(self, *args):
         """Load NIfTI file with comprehensive error handling"""
@@ -571,16 +895,40 @@ class MRIViewer(QWidget):
 
         self.logger.info(f"Loading NIfTI file: {file_path}")
         self.status_bar.showMessage("⏳ Loading NIfTI file...", 0)
+        self.run_load_task(self.read_nifti, partial(self.on_nifti_loaded, file_path), file_path)
 
-        self.sitk_image = sitk.ReadImage(file_path)
-        self.scan_array = sitk.GetArrayFromImage(self.sitk_image)
+    @staticmethod
+    def read_nifti(file_path, progress):
+        """Read a NIfTI scan (worker thread); returns (sitk_image or None, scan_array)"""
+        if (nib is not None and file_path.endswith('.nii')
+                and os.path.getsize(file_path) >= NIFTI_MMAP_MIN_BYTES):
+            # nibabel maps the voxel block; transposing its (x, y, z) array to (z, y, x)
+            # is a view, so slices are paged in from disk only as they are displayed.
+            # The SimpleITK image (geometry for resampling/oblique) is read on first use.
+            return None, np.asanyarray(nib.load(file_path, mmap=True).dataobj).T
+
+        reader = sitk.ImageFileReader()
+        reader.SetFileName(file_path)
+        MRIViewer.track_progress(reader, progress)
+        image = reader.Execute()
+        return image, sitk.GetArrayFromImage(image)
+
+    @safe_execute(show_error=True)
+    def on_nifti_loaded(self, file_path, result):
+        sitk_image, scan_array = result
 
-        if self.scan_array.size == 0:
+        if scan_array.size == 0:
             raise ValueError("Loaded array is empty")
-        if len(self.scan_array.shape) != 3:
-            raise ValueError(f"Expected 3D array, got shape: {self.scan_array.shape}")
+        if len(scan_array.shape) != 3:
+            raise ValueError(f"Expected 3D array, got shape: {scan_array.shape}")
 
+        self.scan_array = scan_array
+        self.sitk_image = sitk_image
+        if sitk_image is None:
+            self._sitk_image_path = file_path
         self.current_scan_path = file_path
+        self.dicom_series_files = None
+        self.orientation_result = None
         self.logger.info(f"Loaded NIfTI data with shape: {self.scan_array.shape}")
 
         self.initialize_viewers()
@@ -599,7 +947,12 @@ class MRIViewer(QWidget):
 
         self.logger.info(f"Loading DICOM series from: {directory_path}")
         self.status_bar.showMessage("⏳ Loading DICOM series...", 0)
+        self.run_load_task(self.read_dicom_series, partial(self.on_dicom_series_loaded, directory_path),
+                           directory_path)
 
+    @staticmethod
+    def read_dicom_series(directory_path, progress):
+        """Read a DICOM series (worker thread); returns (sitk_image, scan_array, file names)"""
         reader = sitk.ImageSeriesReader()
         dicom_series = reader.GetGDCMSeriesFileNames(directory_path)
 
@@ -607,13 +960,27 @@ class MRIViewer(QWidget):
             raise ValueError("No DICOM series found in selected directory")
 
         reader.SetFileNames(dicom_series)
-        self.sitk_image = reader.Execute()
-        self.scan_array = sitk.GetArrayFromImage(self.sitk_image)
+        # Tags are read separately (orientation/organ detection), so skip building the
+        # per-slice metadata dictionaries and private tags; decode on every core
+        reader.MetaDataDictionaryArrayUpdateOff()
+        reader.LoadPrivateTagsOff()
+        reader.SetNumberOfWorkUnits(os.cpu_count() or 1)
+        MRIViewer.track_progress(reader, progress)
+        image = reader.Execute()
+        return image, sitk.GetArrayFromImage(image), dicom_series
 
-        if self.scan_array.size == 0:
+    @safe_execute(show_error=True)
+    def on_dicom_series_loaded(self, directory_path, result):
+        sitk_image, scan_array, dicom_series = result
+
+        if scan_array.size == 0:
             raise ValueError("Loaded DICOM series is empty")
 
+        self.sitk_image = sitk_image
+        self.scan_array = scan_array
         self.current_scan_path = directory_path
+        self.dicom_series_files = dicom_series
+        self.orientation_result = None
         self.logger.info(f"Loaded DICOM series with shape: {self.scan_array.shape}")
 
         self.initialize_viewers()
@@ -636,7 +1003,11 @@ class MRIViewer(QWidget):
 
         self.logger.info(f"Loading single DICOM: {file_path}")
         self.status_bar.showMessage("⏳ Loading DICOM file...", 0)
+        self.run_load_task(self.read_single_dicom, partial(self.on_single_dicom_loaded, file_path), file_path)
 
+    @staticmethod
+    def read_single_dicom(file_path, progress):
+        """Read and decode one DICOM file (worker thread); returns its (frames, H, W) array"""
         dicom_data = pydicom.dcmread(file_path)
 
         if not hasattr(dicom_data, 'pixel_array'):
@@ -646,11 +1017,24 @@ class MRIViewer(QWidget):
 
         if hasattr(dicom_data, 'PhotometricInterpretation') and \
                 dicom_data.PhotometricInterpretation == 'MONOCHROME1':
-            pixel_array = np.max(pixel_array) - pixel_array
+            # Invert in place in the array's own dtype: one pass, no temporary, no upcast
+            if not pixel_array.flags.writeable:
+                pixel_array = pixel_array.copy()
+            np.subtract(pixel_array.max(), pixel_array, out=pixel_array)
+
+        progress(100)
+        # Multi-frame (e.g. enhanced CT/MR) pixel data already is a (frames, H, W) volume
+        if int(getattr(dicom_data, 'NumberOfFrames', 1) or 1) > 1:
+            return np.ascontiguousarray(pixel_array)
+        return pixel_array.reshape(1, *pixel_array.shape)
 
-        self.scan_array = pixel_array[np.newaxis, :, :]
+    @safe_execute(show_error=True)
+    def on_single_dicom_loaded(self, file_path, scan_array):
+        self.scan_array = scan_array
         self.sitk_image = sitk.GetImageFromArray(self.scan_array)
         self.current_scan_path = file_path
+        self.dicom_series_files = [file_path]
+        self.orientation_result = None
 
         self.logger.info(f"Loaded single DICOM with shape: {self.scan_array.shape}")
 
@@ -679,13 +1063,23 @@ class MRIViewer(QWidget):
 
         self.logger.info(f"Loading segmentation from: {file_path}")
         self.status_bar.showMessage("⏳ Loading segmentation...", 0)
+        self.run_load_task(self.read_segmentation, partial(self.on_segmentation_loaded, file_path), file_path)
 
-        # Load segmentation
+    @staticmethod
+    def read_segmentation(file_path, progress):
+        """Read a segmentation mask (worker thread); returns (sitk_image or None, seg_array)"""
         if file_path.endswith('.npy'):
-            seg_array = np.load(file_path)
-        else:
-            seg_image = sitk.ReadImage(file_path)
-            seg_array = sitk.GetArrayFromImage(seg_image)
+            return None, np.load(file_path)
+
+        reader = sitk.ImageFileReader()
+        reader.SetFileName(file_path)
+        MRIViewer.track_progress(reader, progress)
+        seg_image = reader.Execute()
+        return seg_image, sitk.GetArrayFromImage(seg_image)
+
+    @safe_execute(show_error=True)
+    def on_segmentation_loaded(self, file_path, result):
+        seg_image, seg_array = result
 
         # Check if shapes match
         if seg_array.shape != self.scan_array.shape:
@@ -705,18 +1099,28 @@ class MRIViewer(QWidget):
             )
 
             if reply == QMessageBox.Yes:
-                # Calculate zoom factors for each dimension
-                zoom_factors = [
-                    self.scan_array.shape[0] / seg_array.shape[0],
-                    self.scan_array.shape[1] / seg_array.shape[1],
-                    self.scan_array.shape[2] / seg_array.shape[2]
-                ]
-
-                self.logger.info(f"Resampling segmentation with zoom factors: {zoom_factors}")
                 self.status_bar.showMessage("⏳ Resampling segmentation...", 0)
 
-                # Resample using nearest neighbor to preserve label values
-                seg_array = zoom(seg_array, zoom_factors, order=0)  # order=0 for nearest neighbor
+                seg_dtype = seg_array.dtype
+                if seg_image is None:
+                    # A bare .npy has no geometry: assume it covers the scan's field of
+                    # view and stretch the scan's spacing by the shape ratio. SimpleITK has
+                    # no bool pixel type, so boolean masks go through uint8
+                    seg_image = sitk.GetImageFromArray(
+                        seg_array.astype(np.uint8) if seg_dtype == np.bool_ else seg_array)
+                    ref_size = self.sitk_image.GetSize()
+                    seg_image.SetSpacing([sp * r / s for sp, r, s in zip(
+                        self.sitk_image.GetSpacing(), ref_size, seg_image.GetSize())])
+                    seg_image.SetOrigin(self.sitk_image.GetOrigin())
+                    seg_image.SetDirection(self.sitk_image.GetDirection())
+
+                self.logger.info(f"Resampling segmentation {seg_array.shape} onto the scan grid")
+
+                # Multithreaded ITK resampler on the physical geometry; nearest neighbor
+                # preserves label values
+                resampled = sitk.Resample(seg_image, self.sitk_image, sitk.Transform(),
+                                          sitk.sitkNearestNeighbor, 0, seg_image.GetPixelID())
+                seg_array = sitk.GetArrayFromImage(resampled).astype(seg_dtype, copy=False)
 
                 self.logger.info(f"Resampled segmentation to shape: {seg_array.shape}")
             else:
@@ -724,8 +1128,15 @@ class MRIViewer(QWidget):
                 return
 
         self.segmentation_array = seg_array
+        self.prepare_segmentation_outline()
 
-        unique_labels = np.unique(self.segmentation_array)
+        if self.segmentation_array.dtype in (np.bool_, np.uint8, np.uint16):
+            # One O(N) counting pass instead of sorting the whole volume, with per-label counts
+            self.label_counts = np.bincount(self.segmentation_array.ravel())
+            unique_labels = np.flatnonzero(self.label_counts)
+        else:
+            self.label_counts = None
+            unique_labels = np.unique(self.segmentation_array)
         self.logger.info(f"Loaded segmentation with shape: {self.segmentation_array.shape}")
         self.logger.info(f"Unique labels: {unique_labels}")
 
@@ -755,6 +1166,9 @@ class MRIViewer(QWidget):
                 self.outline_enabled = False
                 return
 
+            if self.seg_mask is None:
+                self.prepare_segmentation_outline()
+
             self.toggle_outline_button.setText("🔲 Hide Outline")
             self.status_bar.showMessage("✓ Segmentation outline enabled", 3000)
         else:
@@ -764,6 +1178,31 @@ class MRIViewer(QWidget):
         # Redraw all slices to show/hide the outline
         self.update_all_slices()
 
+    def prepare_segmentation_outline(self):
+        """Threshold the segmentation once and reset the per-slice contour cache"""
+        # Per-axis occupancy flags let empty slices skip contour tracing entirely
+        if njit is not None:
+            self.seg_mask = np.zeros(self.segmentation_array.shape, dtype=np.bool_)
+            self.seg_occupied = [np.zeros(n, dtype=np.bool_) for n in self.seg_mask.shape]
+            _threshold_labels(self.segmentation_array, self.seg_mask, *self.seg_occupied)
+        else:
+            self.seg_mask = self.segmentation_array > 0
+            self.seg_occupied = [self.seg_mask.any(axis=(1, 2)),
+                                 self.seg_mask.any(axis=(0, 2)),
+                                 self.seg_mask.any(axis=(0, 1))]
+        # Like the scan's view stacks: every coronal/sagittal mask slice one contiguous,
+        # z-flipped block, so tracing reads it front to back without a copy
+        if self.seg_mask.nbytes <= VIEW_STACK_MAX_BYTES:
+            flipped = self.seg_mask[::-1]
+            self.seg_views = (self.seg_mask,
+                              np.ascontiguousarray(flipped.transpose(1, 0, 2)),
+                              np.ascontiguousarray(flipped.transpose(2, 0, 1)))
+        else:
+            self.seg_views = (self.seg_mask,
+                              self.seg_mask[::-1].transpose(1, 0, 2),
+                              self.seg_mask[::-1].transpose(2, 0, 1))
+        self.outline_cache = {}
+
     # highlight-end
 
     # highlight-start
@@ -783,12 +1222,8 @@ class MRIViewer(QWidget):
     def auto_detect_orientation(self, dicom_file_path):
         """Automatically detect orientation when DICOM is loaded."""
         try:
-            # Read DICOM file
-            ds = pydicom.dcmread(dicom_file_path)
-            pixel_array = ds.pixel_array
-
-            # Call the prediction function
-            predicted_class, confidence = predict_dicom_image(pixel_array)
+            # Read DICOM file and call the prediction function
+            predicted_class, confidence = self.predict_orientation(dicom_file_path)
 
             # Arabic mapping for display
             arabic_labels = {
@@ -830,6 +1265,28 @@ class MRIViewer(QWidget):
             self.status_bar.showMessage(error_msg, 5000)
             # Don't show popup for auto-detection errors to avoid interrupting workflow
 
+    def predict_orientation(self, dicom_file):
+        """Classify a DICOM file's orientation, reusing the last result for the same file"""
+        if self.orientation_result is not None and self.orientation_result[0] == dicom_file:
+            return self.orientation_result[1:]
+
+        predicted_class, confidence = predict_dicom_image(self.read_orientation_thumbnail(dicom_file))
+        self.orientation_result = (dicom_file, predicted_class, confidence)
+        return predicted_class, confidence
+
+    @staticmethod
+    def read_orientation_thumbnail(dicom_file_path):
+        """Decode just the pixel data of a DICOM file, thinned towards the classifier's input size"""
+        ds = pydicom.dcmread(dicom_file_path, specific_tags=DICOM_PIXEL_TAGS)
+        pixel_array = ds.pixel_array
+        if int(getattr(ds, 'NumberOfFrames', 1) or 1) > 1:
+            pixel_array = pixel_array[len(pixel_array) // 2]  # Classify the middle frame
+        if pixel_array.ndim == 2:
+            # The classifier resizes to IMAGE_SIZE anyway; keep at least that many rows/columns
+            step = max(1, min(pixel_array.shape[0] // IMAGE_SIZE[0], pixel_array.shape[1] // IMAGE_SIZE[1]))
+            pixel_array = pixel_array[::step, ::step]
+        return pixel_array
+
     def detect_orientation_action(self):
         """Manual orientation detection triggered by button."""
         # Make sure a scan is loaded
@@ -840,22 +1297,14 @@ class MRIViewer(QWidget):
             return
 
         try:
-            # Determine the DICOM file to use
-            if os.path.isdir(self.current_scan_path):
-                # It's a directory (DICOM series), use first file
-                reader = sitk.ImageSeriesReader()
-                dicom_series = reader.GetGDCMSeriesFileNames(self.current_scan_path)
-                if not dicom_series:
-                    raise Exception("No DICOM files found in directory")
-                dicom_file = dicom_series[0]
+            # Determine the DICOM file to use: the series was already enumerated at load time
+            if self.dicom_series_files:
+                dicom_file = self.dicom_series_files[0]
             else:
-                # It's a single file
                 dicom_file = self.current_scan_path
 
             # Read DICOM and predict
-            ds = pydicom.dcmread(dicom_file)
-            pixel_array = ds.pixel_array
-            predicted_class, confidence = predict_dicom_image(pixel_array)
+            predicted_class, confidence = self.predict_orientation(dicom_file)
 
             # Arabic mapping for display
             arabic_labels = {
@@ -898,8 +1347,25 @@ class MRIViewer(QWidget):
             return
 
         self.logger.info("Initializing viewers")
+        # New data: drop the cached image artists so the first draw rebuilds them
+        # with fresh extents and zoom limits
+        for ax in (self.axial_ax, self.coronal_ax, self.sagittal_ax):
+            ax.clear()
+            self.reset_view_artists(ax)
+        self.slice_cache.clear()
+        self.oblique_resampler = self.oblique_key = self.oblique_plane_key = None
+        self.scan_gpu = None
+        self.build_view_stacks()
+        self.compute_slice_ranges()
+        self.level_stacks = [None, None, None]
+        self.refresh_level_stacks()
         self.clear_roi(reset_bounds=True)
 
+        sliders = (self.axial_slider, self.coronal_slider, self.sagittal_slider)
+        # update_all_slices below draws everything once; don't queue per-slider renders too
+        for slider in sliders:
+            slider.blockSignals(True)
+
         self.axial_slider.setMaximum(self.scan_array.shape[0] - 1)
         self.coronal_slider.setMaximum(self.scan_array.shape[1] - 1)
         self.sagittal_slider.setMaximum(self.scan_array.shape[2] - 1)
@@ -912,9 +1378,51 @@ class MRIViewer(QWidget):
         self.coronal_slider.setValue(self.crosshair_y)
         self.sagittal_slider.setValue(self.crosshair_x)
 
+        for slider in sliders:
+            slider.blockSignals(False)
+
         self.update_all_slices()
         self.logger.info("Viewers initialized successfully")
 
+    def build_view_stacks(self):
+        """Copy the scan once per side view so each coronal/sagittal slice is one contiguous,
+        display-oriented (z flipped) block"""
+        self.coronal_stack = self.sagittal_stack = None
+        # A memory-mapped scan stays on disk; copying it would read the whole volume
+        if isinstance(self.scan_array, np.memmap) or self.scan_array.nbytes > VIEW_STACK_MAX_BYTES:
+            return
+        self.coronal_stack = np.ascontiguousarray(self.scan_array[::-1].transpose(1, 0, 2))
+        self.sagittal_stack = np.ascontiguousarray(self.scan_array[::-1].transpose(2, 0, 1))
+
+    def compute_slice_ranges(self):
+        """Min/max of every axial, coronal and sagittal slice, reduced once per volume"""
+        self.slice_ranges = None
+        if isinstance(self.scan_array, np.memmap):
+            return  # Reducing a memory-mapped scan would read it all from disk up front
+        scan = self.scan_array
+        # Reduce along x first; both axial and coronal ranges come from the (z, y) result
+        row_min, row_max = scan.min(axis=2), scan.max(axis=2)
+        column_min, column_max = scan.min(axis=1), scan.max(axis=1)
+        self.slice_ranges = (
+            (row_min.min(axis=1), row_max.max(axis=1)),
+            (row_min.min(axis=0), row_max.max(axis=0)),
+            (column_min.min(axis=0), column_max.max(axis=0)),
+        )
+
+    def refresh_level_stacks(self):
+        """(Re)window each view's whole stack whose window no longer matches the view's"""
+        if self.slice_ranges is None or 3 * self.scan_array.size > LEVEL_STACK_MAX_BYTES:
+            return
+        for idx, stack in enumerate((self.scan_array, self.coronal_stack, self.sagittal_stack)):
+            window = (self.brightness[idx], self.contrast[idx])
+            if stack is None or (self.level_stacks[idx] is not None and self.level_stacks[idx][:2] == window):
+                continue
+            low, high = self.slice_ranges[idx]
+            levels = np.empty(stack.shape, dtype=np.uint8)
+            for i in range(len(stack)):
+                levels[i] = self.window_slice(stack[i], idx, (low[i], high[i]))
+            self.level_stacks[idx] = window + (levels,)
+
     def on_press(self, event, view_index):
         if event.button == 1 and event.inaxes:
             if self.draw_roi_button.isChecked():
@@ -923,23 +1431,28 @@ class MRIViewer(QWidget):
                 self.active_roi_view_index = view_index
                 self.clear_roi(reset_bounds=False)
 
-                patch = plt.Rectangle(self.roi_start_pos, 0, 0, edgecolor='cyan', facecolor='none', lw=2)
-                event.inaxes.add_patch(patch)
-
-                if view_index == 0:
-                    self.axial_ax.roi_patch = patch
-                elif view_index == 1:
-                    self.coronal_ax.roi_patch = patch
-                elif view_index == 2:
-                    self.sagittal_ax.roi_patch = patch
-
-                event.inaxes.figure.canvas.draw_idle()
+                # The rubber band is animated and unantialiased: a full draw leaves it out, and
+                # each mouse move repaints only this axes from the saved background (blitting).
+                # Each view creates it once and hides it between drags.
+                ax = (self.axial_ax, self.coronal_ax, self.sagittal_ax)[view_index]
+                if getattr(ax, 'roi_patch', None) is None:
+                    ax.roi_patch = ax.add_patch(plt.Rectangle((0, 0), 0, 0, edgecolor='cyan', facecolor='none',
+                                                              lw=2, animated=True, antialiased=False))
+                ax.roi_patch.set_bounds(*self.roi_start_pos, 0, 0)
+                ax.roi_patch.set_visible(True)
+
+                # Blitting reuses the background saved by the last full draw; only draw now if
+                # that background is missing or stale
+                if getattr(event.inaxes, 'background', None) is None or event.inaxes.redraw_pending:
+                    event.inaxes.figure.canvas.draw()
             else:
                 self.update_crosshairs_on_click(event)
         elif event.button == 3:
+            # Qt's override cursors stack: push one per drag, however many presses arrive
+            if not self.adjusting_window:
+                QApplication.setOverrideCursor(Qt.BlankCursor)
             self.adjusting_window = True
             self.last_mouse_pos = (event.x, event.y)
-            QApplication.setOverrideCursor(Qt.BlankCursor)
 
     def on_motion(self, event, view_index):
         if self.drawing_roi and event.inaxes and self.roi_start_pos:
@@ -956,7 +1469,7 @@ class MRIViewer(QWidget):
             if patch:
                 patch.set_width(width)
                 patch.set_height(height)
-                event.inaxes.figure.canvas.draw_idle()
+                self.blit_overlays(event.inaxes)
         elif self.adjusting_window and self.last_mouse_pos is not None:
             dx = event.x - self.last_mouse_pos[0]
             dy = event.y - self.last_mouse_pos[1]
@@ -965,10 +1478,26 @@ class MRIViewer(QWidget):
             self.brightness[view_index] += dy
 
             self.last_mouse_pos = (event.x, event.y)
-            self.update_display(view_index)
+            if self.global_window_level:
+                # Apply the dragged view's window to all three views
+                self.brightness = [self.brightness[view_index]] * 3
+                self.contrast = [self.contrast[view_index]] * 3
+                self.window_pending.update((0, 1, 2))
+            else:
+                self.window_pending.add(view_index)
+            # Motion events arrive faster than frames; render once per event-loop pass
+            self.window_timer.isActive() or self.window_timer.start()
         elif event.button == 1 and not self.draw_roi_button.isChecked():
             self.update_crosshairs(event)
 
+    def flush_window_update(self):
+        pending, self.window_pending = self.window_pending, set()
+        if len(pending) == 3:
+            self.update_all_slices()
+        else:
+            for view_index in pending:
+                self.update_display(view_index)
+
     def on_release(self, event, view_index):
         if self.drawing_roi and event.button == 1 and event.inaxes:
             self.drawing_roi = False
@@ -980,177 +1509,316 @@ class MRIViewer(QWidget):
             x_min, x_max = min(x_start, x_end), max(x_start, x_end)
             y_min, y_max = min(y_start, y_end), max(y_start, y_end)
 
+            # The committed ROI is shown by each view's ROI box; drop the rubber band
+            roi_ax = (self.axial_ax, self.coronal_ax, self.sagittal_ax)[self.active_roi_view_index]
+            if getattr(roi_ax, 'roi_patch', None) is not None:
+                roi_ax.roi_patch.set_visible(False)
+
             self.store_roi_bounds(self.active_roi_view_index, x_min, x_max, y_min, y_max)
             self.apply_roi_limits()
             self.update_all_slices()
         elif event.button == 3:
+            if self.adjusting_window:
+                QApplication.restoreOverrideCursor()
+                self.refresh_level_stacks()  # Scrolling at the new window is indexing again
             self.adjusting_window = False
             self.last_mouse_pos = None
-            QApplication.restoreOverrideCursor()
 
     def update_crosshairs_on_click(self, event):
+        self.update_crosshairs(event)
+
+    def update_crosshairs(self, event):
         if event.inaxes is None or event.button != 1:
             return
 
+        x, y, z = self.crosshair_x, self.crosshair_y, self.crosshair_z
         if event.inaxes == self.axial_ax:
-            self.crosshair_x = int(event.xdata)
-            self.crosshair_y = int(event.ydata)
-            self.sagittal_slider.setValue(self.crosshair_x)
-            self.coronal_slider.setValue(self.crosshair_y)
+            x, y = int(event.xdata), int(event.ydata)
         elif event.inaxes == self.coronal_ax:
-            self.crosshair_x = int(event.xdata)
-            self.crosshair_z = self.scan_array.shape[0] - 1 - int(event.ydata)
-            self.sagittal_slider.setValue(self.crosshair_x)
-            self.axial_slider.setValue(self.crosshair_z)
+            x = int(event.xdata)
+            z = self.scan_array.shape[0] - 1 - int(event.ydata)
         elif event.inaxes == self.sagittal_ax:
-            self.crosshair_y = int(event.xdata)
-            self.crosshair_z = self.scan_array.shape[0] - 1 - int(event.ydata)
-            self.coronal_slider.setValue(self.crosshair_y)
-            self.axial_slider.setValue(self.crosshair_z)
+            y = int(event.xdata)
+            z = self.scan_array.shape[0] - 1 - int(event.ydata)
+        else:
+            return
 
+        # update_all_slices below renders every view; don't also queue per-slider renders.
+        # Reading the values back applies the sliders' (ROI) range.
+        sliders = ((self.axial_slider, z), (self.coronal_slider, y), (self.sagittal_slider, x))
+        for slider, value in sliders:
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+        position = tuple(slider.value() for slider, _ in sliders)
+
+        # Dragging within one voxel, or clicking the current position, changes nothing
+        if position == (self.crosshair_z, self.crosshair_y, self.crosshair_x):
+            return
+        self.crosshair_z, self.crosshair_y, self.crosshair_x = position
         self.update_all_slices()
 
-    def update_crosshairs(self, event):
-        if event.inaxes and event.button == 1:
-            if event.inaxes == self.axial_ax:
-                self.crosshair_x, self.crosshair_y = int(event.xdata), int(event.ydata)
-                self.sagittal_slider.setValue(self.crosshair_x)
-                self.coronal_slider.setValue(self.crosshair_y)
-            elif event.inaxes == self.coronal_ax:
-                self.crosshair_x = int(event.xdata)
-                self.crosshair_z = self.scan_array.shape[0] - 1 - int(event.ydata)
-                self.sagittal_slider.setValue(self.crosshair_x)
-                self.axial_slider.setValue(self.crosshair_z)
-            elif event.inaxes == self.sagittal_ax:
-                self.crosshair_y = int(event.xdata)
-                self.crosshair_z = self.scan_array.shape[0] - 1 - int(event.ydata)
-                self.coronal_slider.setValue(self.crosshair_y)
-                self.axial_slider.setValue(self.crosshair_z)
-            self.update_all_slices()
-
     def update_axial_slice(self, value):
         self.crosshair_z = value
         if self.scan_array is not None:
             self.show_axial_slice(self.scan_array, value)
         if self.oblique_enabled:
-            self.show_oblique_view()
+            self.oblique_timer.start()
 
     def update_coronal_slice(self, value):
         self.crosshair_y = value
         if self.scan_array is not None:
             self.show_coronal_slice(self.scan_array, value)
         if self.oblique_enabled:
-            self.show_oblique_view()
+            self.oblique_timer.start()
 
     def update_sagittal_slice(self, value):
         self.crosshair_x = value
         if self.scan_array is not None:
             self.show_sagittal_slice(self.scan_array, value)
         if self.oblique_enabled:
-            self.show_oblique_view()
+            self.oblique_timer.start()
 
     def update_all_slices(self):
-        self.update_axial_slice(self.crosshair_z)
-        self.update_coronal_slice(self.crosshair_y)
-        self.update_sagittal_slice(self.crosshair_x)
+        if self.scan_array is not None:
+            self.show_axial_slice(self.scan_array, self.crosshair_z)
+            self.show_coronal_slice(self.scan_array, self.crosshair_y)
+            self.show_sagittal_slice(self.scan_array, self.crosshair_x)
+        # The oblique plane depends on all three crosshairs; resample it once they settle
+        if self.oblique_enabled:
+            self.oblique_timer.start()
         # highlight-start
         # Removed logic for updating 4th panel sliders
         # highlight-end
 
     def show_axial_slice(self, scan, slice_index):
-        self.axial_ax.clear()
+        ax = self.axial_ax
         slice_data = scan[slice_index, :, :]
-        self.display_slice(self.axial_ax, slice_data, f"Axial View (Slice {slice_index})", 0)
+        changed = self.display_slice(ax, slice_data, f"Axial View (Slice {slice_index})", 0, slice_index)
 
         # highlight-start
         # Draw outline if enabled
-        if self.outline_enabled and self.segmentation_array is not None:
-            seg_slice = self.segmentation_array[slice_index, :, :]
-            self.draw_surface_outline(self.axial_ax, seg_slice)
+        changed |= self.draw_surface_outline(ax, 0, slice_index)
         # highlight-end
 
+        roi = None
         if self.roi_bounds_3d:
             z_min, z_max, y_min, y_max, x_min, x_max = self.roi_bounds_3d
             if z_min <= slice_index <= z_max:
-                rect = plt.Rectangle((x_min, y_min), x_max - x_min, y_max - y_min,
-                                     edgecolor='cyan', facecolor='none', lw=2)
-                self.axial_ax.add_patch(rect)
+                roi = ((x_min, y_min), x_max - x_min, y_max - y_min)
 
-        self.axial_ax.axvline(self.crosshair_x, color='#00adb5', linestyle='--', linewidth=1, alpha=0.7)
-        self.axial_ax.axhline(self.crosshair_y, color='#00adb5', linestyle='--', linewidth=1, alpha=0.7)
-        self.axial_canvas.draw()
+        moved = self.update_view_overlays(ax, self.crosshair_x, self.crosshair_y, roi)
+        self.refresh_view(ax, changed, moved)
 
     def show_coronal_slice(self, scan, slice_index):
-        self.coronal_ax.clear()
-        slice_data = np.flipud(scan[:, slice_index, :])
-        self.display_slice(self.coronal_ax, slice_data, f"Coronal View (Slice {slice_index})", 1)
+        ax = self.coronal_ax
+        if self.coronal_stack is not None:
+            slice_data = self.coronal_stack[slice_index]
+        else:
+            slice_data = np.flipud(scan[:, slice_index, :])
+        changed = self.display_slice(ax, slice_data, f"Coronal View (Slice {slice_index})", 1, slice_index)
 
         # highlight-start
         # Draw outline if enabled
-        if self.outline_enabled and self.segmentation_array is not None:
-            seg_slice = np.flipud(self.segmentation_array[:, slice_index, :])
-            self.draw_surface_outline(self.coronal_ax, seg_slice)
+        changed |= self.draw_surface_outline(ax, 1, slice_index)
         # highlight-end
 
+        roi = None
         if self.roi_bounds_3d:
             z_min, z_max, y_min, y_max, x_min, x_max = self.roi_bounds_3d
             if y_min <= slice_index <= y_max:
                 z_plot_min = scan.shape[0] - 1 - z_max
-                height = z_max - z_min
-                rect = plt.Rectangle((x_min, z_plot_min), x_max - x_min, height,
-                                     edgecolor='cyan', facecolor='none', lw=2)
-                self.coronal_ax.add_patch(rect)
+                roi = ((x_min, z_plot_min), x_max - x_min, z_max - z_min)
 
-        self.coronal_ax.axvline(self.crosshair_x, color='#00adb5', linestyle='--', linewidth=1, alpha=0.7)
-        self.coronal_ax.axhline(scan.shape[0] - 1 - self.crosshair_z, color='#00adb5',
-                                linestyle='--', linewidth=1, alpha=0.7)
-        self.coronal_canvas.draw()
+        moved = self.update_view_overlays(ax, self.crosshair_x, scan.shape[0] - 1 - self.crosshair_z, roi)
+        self.refresh_view(ax, changed, moved)
 
     def show_sagittal_slice(self, scan, slice_index):
-        self.sagittal_ax.clear()
-        slice_data = np.flipud(scan[:, :, slice_index])
-        self.display_slice(self.sagittal_ax, slice_data, f"Sagittal View (Slice {slice_index})", 2)
+        ax = self.sagittal_ax
+        if self.sagittal_stack is not None:
+            slice_data = self.sagittal_stack[slice_index]
+        else:
+            slice_data = np.flipud(scan[:, :, slice_index])
+        changed = self.display_slice(ax, slice_data, f"Sagittal View (Slice {slice_index})", 2, slice_index)
 
         # highlight-start
         # Draw outline if enabled
-        if self.outline_enabled and self.segmentation_array is not None:
-            seg_slice = np.flipud(self.segmentation_array[:, :, slice_index])
-            self.draw_surface_outline(self.sagittal_ax, seg_slice)
+        changed |= self.draw_surface_outline(ax, 2, slice_index)
         # highlight-end
 
+        roi = None
         if self.roi_bounds_3d:
             z_min, z_max, y_min, y_max, x_min, x_max = self.roi_bounds_3d
             if x_min <= slice_index <= x_max:
                 z_plot_min = scan.shape[0] - 1 - z_max
-                height = z_max - z_min
-                rect = plt.Rectangle((y_min, z_plot_min), y_max - y_min, height,
-                                     edgecolor='cyan', facecolor='none', lw=2)
-                self.sagittal_ax.add_patch(rect)
+                roi = ((y_min, z_plot_min), y_max - y_min, z_max - z_min)
 
-        self.sagittal_ax.axvline(self.crosshair_y, color='#00adb5', linestyle='--', linewidth=1, alpha=0.7)
-        self.sagittal_ax.axhline(scan.shape[0] - 1 - self.crosshair_z, color='#00adb5',
-                                 linestyle='--', linewidth=1, alpha=0.7)
-        self.sagittal_canvas.draw()
+        moved = self.update_view_overlays(ax, self.crosshair_y, scan.shape[0] - 1 - self.crosshair_z, roi)
+        self.refresh_view(ax, changed, moved)
 
-    def draw_surface_outline(self, ax, seg_slice):
-        """Draw ONLY the outer surface outline for segmentation on a given axis"""
+    @staticmethod
+    def update_view_overlays(ax, x, y, roi):
+        """Move a view's crosshair and ROI box (created once, animated so they can be blitted);
+        returns False if they are already in place"""
+        if (x, y, roi) == getattr(ax, 'overlay_state', None):
+            return False
+        ax.overlay_state = (x, y, roi)
+
+        if getattr(ax, 'crosshair_v', None) is None:
+            style = dict(color='#00adb5', linestyle='--', linewidth=1, alpha=0.7, animated=True)
+            ax.crosshair_v = ax.axvline(x, **style)
+            ax.crosshair_h = ax.axhline(y, **style)
+            ax.roi_box = ax.add_patch(plt.Rectangle((0, 0), 0, 0, edgecolor='cyan', facecolor='none', lw=2,
+                                                    animated=True))
+
+        ax.crosshair_v.set_xdata([x, x])
+        ax.crosshair_h.set_ydata([y, y])
+        if roi is None:
+            ax.roi_box.set_visible(False)
+        else:
+            (x0, y0), width, height = roi
+            ax.roi_box.set_bounds(x0, y0, width, height)
+            ax.roi_box.set_visible(True)
+        return True
 
-        if seg_slice is None or seg_slice.size == 0:
-            return
+    @staticmethod
+    def animated_slice(ax):
+        # The image, outline and title are animated too, so a slice change is blitted
+        # over the saved empty-axes background instead of re-rendering the figure
+        artists = []
+        if getattr(ax, 'slice_image', None) is not None:
+            artists.append(ax.slice_image)
+        if getattr(ax, 'outline_line', None) is not None:
+            artists.append(ax.outline_line)
+        artists.append(ax.title)
+        return artists
 
-        # Create a binary mask of ALL segmentation (any non-zero value)
-        combined_mask = (seg_slice > 0).astype(np.uint8)
+    @staticmethod
+    def animated_overlays(ax):
+        overlays = []
+        if getattr(ax, 'crosshair_v', None) is not None:
+            overlays += [ax.crosshair_v, ax.crosshair_h, ax.roi_box]
+        if getattr(ax, 'roi_patch', None) is not None:
+            overlays.append(ax.roi_patch)  # ROI rubber band, visible while dragged
+        return overlays
+
+    def refresh_view(self, ax, full, moved=True):
+        """Repaint a view: blit the slice and overlays if its image or outline changed, else
+        blit only the overlays if they moved"""
+        if getattr(ax, 'background', None) is None or getattr(ax, 'redraw_pending', False):
+            self.request_redraw(ax)
+        elif full:
+            self.blit_slice(ax)
+        elif moved:
+            self.blit_overlays(ax)
+
+    def blit_slice(self, ax):
+        # Paste the empty-axes background back, draw the new slice over it and keep that
+        # frame for overlay-only moves; the layout and limits are unchanged, so no full draw
+        canvas = ax.figure.canvas
+        canvas.restore_region(ax.background)
+        for artist in self.animated_slice(ax):
+            ax.draw_artist(artist)
+        ax.frame = canvas.copy_from_bbox(ax.figure.bbox)
+        for artist in self.animated_overlays(ax):
+            ax.draw_artist(artist)
+        canvas.blit(ax.figure.bbox)
+
+    def blit_overlays(self, ax):
+        # Only the crosshair/ROI moved: paste the saved slice frame back and draw
+        # the animated overlays on top of it, without rasterizing the slice again
+        canvas = ax.figure.canvas
+        canvas.restore_region(ax.frame)
+        for artist in self.animated_overlays(ax):
+            ax.draw_artist(artist)
+        canvas.blit(ax.bbox)
 
-        if np.sum(combined_mask) == 0:
-            return  # Nothing to draw
+    @staticmethod
+    def request_redraw(ax):
+        # draw_idle queues one repaint per event-loop pass, so a burst of slider ticks
+        # rasterizes the figure once instead of once per tick
+        ax.redraw_pending = True
+        ax.figure.canvas.draw_idle()
+
+    def on_canvas_draw(self, ax):
+        """After a full draw, keep the static backgrounds for blitting and paint the animated artists"""
+        canvas = ax.figure.canvas
+        ax.background = canvas.copy_from_bbox(ax.figure.bbox)
+        ax.redraw_pending = False
+        for artist in self.animated_slice(ax):
+            ax.draw_artist(artist)
+        ax.frame = canvas.copy_from_bbox(ax.figure.bbox)
+        for artist in self.animated_overlays(ax):
+            ax.draw_artist(artist)
+
+    @staticmethod
+    def reset_view_artists(ax):
+        """Forget the per-view artists and blitting state after ax.clear()"""
+        for name in ('slice_image', 'display_key', 'outline_line', 'outline_contour', 'crosshair_v',
+                     'crosshair_h', 'roi_box', 'roi_patch', 'overlay_state', 'background', 'frame'):
+            setattr(ax, name, None)
+        ax.title.set_animated(True)  # ax.clear() made a new title
+
+    def draw_surface_outline(self, ax, view_index, slice_index):
+        """Draw ONLY the outer surface outline for segmentation on a given axis; True if it changed"""
+
+        largest_contour = None
+        if self.outline_enabled and self.segmentation_array is not None:
+            key = (view_index, slice_index)
+            if key not in self.outline_cache:
+                self.outline_cache[key] = self.find_outer_contour(view_index, slice_index)
+            largest_contour = self.outline_cache[key]
+
+        # Contours are cached arrays, so identity tells whether the drawn outline is current
+        if largest_contour is getattr(ax, 'outline_contour', None):
+            return False
+        ax.outline_contour = largest_contour
+
+        if getattr(ax, 'outline_line', None) is None:
+            if cv2 is None and njit is not None:
+                # Boundary pixels from _mask_boundary are unordered, so draw them as points
+                ax.outline_line, = ax.plot([], [], 's', color='#FF3333', markersize=1, markeredgewidth=0,
+                                          animated=True)
+            else:
+                ax.outline_line, = ax.plot([], [], color='#FF3333', linewidth=1.5, alpha=1.0, animated=True)
+        if largest_contour is None:
+            ax.outline_line.set_visible(False)
+        else:
+            ax.outline_line.set_data(largest_contour[:, 1], largest_contour[:, 0])
+            ax.outline_line.set_visible(True)
+        return True
+
+    def find_outer_contour(self, view_index, slice_index):
+        """Trace the outer contour of one slice of the segmentation mask in display coordinates"""
+
+        if self.seg_mask is None or not self.seg_occupied[view_index][slice_index]:
+            return None  # Nothing to draw
+
+        combined_mask = self.seg_views[view_index][slice_index]
 
         try:
+            if cv2 is not None:
+                # Border following in C; RETR_EXTERNAL returns only outer contours, no holes
+                # A contiguous bool slice is reinterpreted as uint8 in place, not cast
+                contours, _ = cv2.findContours(np.ascontiguousarray(combined_mask).view(np.uint8),
+                                               cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+                if not contours:
+                    return None
+                largest_contour = max(contours, key=cv2.contourArea)[:, 0, ::-1]  # (x, y) -> (row, col)
+                return np.vstack((largest_contour, largest_contour[:1]))  # Close the loop
+
+            if njit is not None:
+                # No tracing at all: mark boundary pixels in one parallel pass over the slice
+                boundary = np.zeros(combined_mask.shape, dtype=np.bool_)
+                _mask_boundary(np.ascontiguousarray(combined_mask), boundary)
+                return np.argwhere(boundary)
+
             # --- NEW ROBUST STRATEGY ---
             # 1. Find ALL contours in the combined mask
-            contours = measure.find_contours(combined_mask, 0.5)
+            contours = measure.find_contours(combined_mask.view(np.uint8), 0.5)
 
             if not contours:
-                return  # No contours found
+                return None  # No contours found
 
             # 2. Find the contour that encloses the largest area
             largest_contour = None
@@ -1167,22 +1835,127 @@ class MRIViewer(QWidget):
                     max_area = area
                     largest_contour = contour
 
-            # 3. Draw only the largest contour (which is the outer one)
-            if largest_contour is not None:
-                ax.plot(largest_contour[:, 1], largest_contour[:, 0],
-                        color='#FF3333', linewidth=1.5, alpha=1.0)
+            # 3. Keep only the largest contour (which is the outer one)
             # --- END NEW STRATEGY ---
+            return largest_contour
 
         except Exception as e:
             # Log the error, which might explain why nothing appeared
             self.logger.error(f"Error drawing outer surface outline: {e}", exc_info=True)
+            return None
 
-    def display_slice(self, ax, slice_data, title, idx):
-        adjusted_slice = (slice_data + self.brightness[idx]) * self.contrast[idx]
-        ax.imshow(adjusted_slice, cmap=self.current_colormap,
-                  vmin=np.min(slice_data), vmax=np.max(slice_data))
+    def display_slice(self, ax, slice_data, title, idx, slice_index=None, full_shape=None):
+        """Show a slice in a view's image artist; returns False if it was already shown.
+        full_shape is the pixel grid the image spans when slice_data is a reduced copy"""
+        # While a view's slider is being dragged, render only every step-th pixel when the
+        # slice has more pixels than the axes can show; the image keeps its full extent
+        step = 1
+        if slice_index is not None and self.view_slider(idx).isSliderDown():
+            step = self.preview_step(ax, slice_data.shape)
+
+        # Scrolling back over a slice with an unchanged window reuses its quantized levels;
+        # the oblique view (no slice_index) is always windowed fresh
+        key = None
+        levels = None
+        if slice_index is not None:
+            key = (idx, slice_index, self.brightness[idx], self.contrast[idx], step)
+            if (key, self.current_colormap) == getattr(ax, 'display_key', None):
+                return False  # Already showing exactly this image
+            stacked = self.level_stacks[idx]
+            if step == 1 and stacked is not None and stacked[:2] == (self.brightness[idx], self.contrast[idx]):
+                levels = stacked[2][slice_index]  # A view into the pre-windowed stack
+            else:
+                levels = self.slice_cache.get(key)
+                if levels is not None:
+                    self.slice_cache.move_to_end(key)
+        lut = colormap_lut(self.current_colormap)
+        rgba = None
+        if levels is None:
+            vrange = None
+            if slice_index is not None and self.slice_ranges is not None:
+                low, high = self.slice_ranges[idx]
+                vrange = (low[slice_index], high[slice_index])
+            data = slice_data[::step, ::step]
+            if njit is not None and (key is None or self.adjusting_window):
+                # Nothing worth caching (the oblique view, or a window being dragged):
+                # window and colormap the slice in one pass
+                gain, offset = self.window_transform(data, idx, vrange)
+                packed = np.empty(data.shape, dtype=np.uint32)
+                _window_rgba(data, gain, offset, lut, packed)
+                rgba = packed.view(np.uint8).reshape(data.shape + (4,))
+            else:
+                levels = self.window_slice(data, idx, vrange)
+                if key is not None:
+                    self.slice_cache[key] = levels
+                    if len(self.slice_cache) > SLICE_CACHE_SIZE:
+                        self.slice_cache.popitem(last=False)
+        if rgba is None:
+            # The colormap is a single uint32 gather over the cached levels
+            rgba = apply_lut(levels, lut)
+
+        height, width = full_shape or slice_data.shape
+        image = getattr(ax, 'slice_image', None)
+        if image is None or ax.slice_shape != (height, width):
+            if image is not None:
+                image.remove()
+            # Create the image artist once per view with the full-resolution pixel extent...
+            extent = (-0.5, width - 0.5, height - 0.5, -0.5)
+            ax.slice_image = SliceImage(ax, extent=extent)
+            ax.slice_image.set_data(rgba)
+            ax.slice_image.set_clip_path(ax.patch)
+            ax.set_aspect('equal')
+            ax.add_image(ax.slice_image)
+            ax.slice_image.set_extent(extent)  # Fits the view limits, as imshow does
+            ax.slice_shape = (height, width)
+            ax.axis('off')
+            if slice_index is not None:
+                # The linked views blit their image; a new artist (and aspect) needs one full draw
+                ax.slice_image.set_animated(True)
+                self.request_redraw(ax)
+        else:
+            # ...then only swap pixels: no new artist
+            image.set_data(rgba)
+        ax.display_key = (key, self.current_colormap) if key is not None else None
         ax.set_title(title, color='#00adb5', fontsize=11, pad=10, weight='bold')
-        ax.axis('off')
+        return True
+
+    def view_slider(self, idx):
+        return (self.axial_slider, self.coronal_slider, self.sagittal_slider)[idx]
+
+    @staticmethod
+    def preview_step(ax, shape):
+        """Largest integer stride that still leaves at least one source pixel per screen pixel"""
+        height, width = shape
+        return max(1, int(min(height / max(ax.bbox.height, 1), width / max(ax.bbox.width, 1))))
+
+    def window_transform(self, slice_data, idx, vrange=None):
+        """(gain, offset) mapping raw values of a slice to colormap levels for view idx"""
+        if vrange is None:
+            vrange = (np.min(slice_data), np.max(slice_data))
+        vmin, vmax = float(vrange[0]), float(vrange[1])
+        # Same binning as Normalize + Colormap: [vmin, vmax] onto DISPLAY_LEVELS entries
+        scale = DISPLAY_LEVELS / (vmax - vmin) if vmax > vmin else 0.0
+        # ((x + b) * c - vmin) * scale, folded into a single multiply-add per pixel
+        gain = self.contrast[idx] * scale
+        offset = (self.brightness[idx] * self.contrast[idx] - vmin) * scale
+        return float(gain), float(offset)
+
+    def window_slice(self, slice_data, idx, vrange=None):
+        """Apply brightness/contrast and quantize the slice to uint8 colormap levels"""
+        gain, offset = self.window_transform(slice_data, idx, vrange)
+
+        if njit is not None:
+            levels = np.empty(slice_data.shape, dtype=np.uint8)
+            _window_levels(slice_data, gain, offset, levels)
+            return levels
+
+        t = slice_data * np.float32(gain)
+        t += np.float32(offset)
+        np.clip(t, 0, DISPLAY_LEVELS - 1, out=t)
+        return t.astype(np.uint8)
+
+    def toggle_global_window_level(self, checked):
+        self.global_window_level = checked
 
     def update_display(self, idx):
         if idx == 0:
@@ -1220,80 +1993,163 @@ class MRIViewer(QWidget):
             angle_x = self.oblique_angle_x_slider.value()
             angle_y = self.oblique_angle_y_slider.value()
 
-            ax = np.deg2rad(angle_x)
-            ay = np.deg2rad(angle_y)
-
-            cross_index = [self.crosshair_x, self.crosshair_y, self.crosshair_z]
-            center = self.sitk_image.TransformContinuousIndexToPhysicalPoint(cross_index)
-
-            transform = sitk.Euler3DTransform()
-            transform.SetCenter(center)
-            transform.SetRotation(ax, ay, 0.0)
-
-            resampler = sitk.ResampleImageFilter()
-            resampler.SetReferenceImage(self.sitk_image)
-            resampler.SetInterpolator(sitk.sitkLinear)
-            resampler.SetTransform(transform)
-            resampled = resampler.Execute(self.sitk_image)
-
-            arr = sitk.GetArrayFromImage(resampled)
-            self.oblique_array = arr
-
+            preview = self.oblique_angle_x_slider.isSliderDown() or self.oblique_angle_y_slider.isSliderDown()
+            factor = OBLIQUE_PREVIEW_FACTOR if preview else 1
+
+            # Brightness/contrast or colormap changes only re-display the cached plane
+            key = (angle_x, angle_y, self.crosshair_x, self.crosshair_y, self.crosshair_z, factor)
+            if key != self.oblique_key:
+                ax = np.deg2rad(angle_x)
+                ay = np.deg2rad(angle_y)
+
+                cross_index = [self.crosshair_x, self.crosshair_y, self.crosshair_z]
+                center = self.sitk_image.TransformContinuousIndexToPhysicalPoint(cross_index)
+
+                if self.oblique_resampler is None:
+                    self.oblique_transform = sitk.Euler3DTransform()
+                    self.oblique_resampler = sitk.ResampleImageFilter()
+                    self.oblique_resampler.SetReferenceImage(self.sitk_image)
+
+                # One plane of the scan's grid (update_oblique_slice places it at the slice
+                # shown); a preview samples it every factor-th pixel
+                width, height = self.sitk_image.GetSize()[:2]
+                spacing_x, spacing_y, spacing_z = self.sitk_image.GetSpacing()
+                self.oblique_resampler.SetSize([max(1, width // factor), max(1, height // factor), 1])
+                self.oblique_resampler.SetOutputSpacing([spacing_x * factor, spacing_y * factor, spacing_z])
+                self.oblique_resampler.SetInterpolator(sitk.sitkNearestNeighbor if preview else sitk.sitkLinear)
+                self.oblique_transform.SetCenter(center)
+                self.oblique_transform.SetRotation(ax, ay, 0.0)
+                # SetTransform stores a copy, so hand over the updated transform each time
+                self.oblique_resampler.SetTransform(self.oblique_transform)
+                self.oblique_key = key
             if not hasattr(self, 'oblique_fig'):
-                self.oblique_fig, self.oblique_ax = plt.subplots(facecolor='#1e1e1e')
+                self.oblique_fig = Figure(facecolor='#1e1e1e')
+                self.oblique_ax = self.oblique_fig.add_subplot()
                 self.oblique_fig.patch.set_facecolor('#1e1e1e')
                 self.oblique_fig.tight_layout(pad=0.1)
                 self.oblique_canvas = FigureCanvas(self.oblique_fig)
+                self.setup_canvas_painting(self.oblique_canvas)
                 self.oblique_slider = QSlider(Qt.Horizontal)
                 self.oblique_slider.setMinimum(0)
-                self.oblique_slider.setMaximum(arr.shape[0] - 1)
-                self.oblique_slider.setValue(arr.shape[0] // 2)
-                self.oblique_slider.valueChanged.connect(self.update_oblique_slice)
+                depth = self.sitk_image.GetDepth()
+                self.oblique_slider.setMaximum(depth - 1)
+                self.oblique_slider.setValue(depth // 2)
+                self.throttle_slider(self.oblique_slider, self.update_oblique_slice)
                 self.oblique_group = self.create_viewport_group("Oblique View", self.oblique_canvas,
                                                                 self.oblique_slider)
                 self.grid_layout.addWidget(self.oblique_group, 1, 1)
 
-            slice_index = self.oblique_slider.value()
-            slice_data = self.oblique_array[slice_index, :, :]
-            self.oblique_ax.clear()
-            # Oblique view uses the first view's B/C settings for simplicity
-            self.display_slice(self.oblique_ax, slice_data, f"Oblique View ({angle_x}°, {angle_y}°)", 0)
-            self.oblique_canvas.draw()
+            self.update_oblique_slice(self.oblique_slider.value())
 
         except Exception as e:
             self.status_bar.showMessage(f"Error generating oblique view: {e}")
 
+    def resample_oblique_plane(self, value):
+        """Slice `value` of the rotated scan: the output grid's plane at that index, resampled
+        alone (O(N^2) per change instead of the whole O(N^3) volume)"""
+        linear, offset = self.oblique_plane_affine(value)
+        if np.allclose(linear, np.rint(linear), atol=1e-6) and np.allclose(offset, np.rint(offset), atol=1e-6):
+            # Axis-aligned angles (multiples of 90° on isotropic voxels): every pixel lands
+            # on a voxel, so interpolating would only reproduce the voxel values
+            return self.gather_oblique_plane(np.rint(linear).astype(np.intp), np.rint(offset).astype(np.intp))
+
+        if cp is not None and self.scan_gpu is not False:
+            try:
+                return self.sample_oblique_plane_gpu(value)
+            except cp.cuda.memory.OutOfMemoryError:
+                self.scan_gpu = False
+                self.logger.warning("Not enough GPU memory for the scan; resampling on the CPU")
+
+        self.oblique_resampler.SetOutputOrigin(self.sitk_image.TransformIndexToPhysicalPoint((0, 0, value)))
+        return sitk.GetArrayFromImage(self.oblique_resampler.Execute(self.sitk_image))[0]
+
+    def oblique_plane_affine(self, value):
+        """(linear, offset) taking a plane pixel (column, row) to a continuous (z, y, x) scan index,
+        the same mapping the SimpleITK resampler applies"""
+        image = self.sitk_image
+        factor = self.oblique_key[-1]
+        origin = np.array(image.GetOrigin())
+        index_to_point = np.array(image.GetDirection()).reshape(3, 3) * np.array(image.GetSpacing())
+        rotation = np.array(self.oblique_transform.GetMatrix()).reshape(3, 3)
+        center = np.array(self.oblique_transform.GetCenter())
+        translation = np.array(self.oblique_transform.GetTranslation())
+
+        # Output index -> point -> rotated point (R (p - c) + c + t) -> scan index
+        linear = np.linalg.solve(index_to_point, rotation @ index_to_point)
+        offset = np.linalg.solve(index_to_point, rotation @ (origin - center) + center + translation - origin)
+        offset = offset + linear[:, 2] * value
+        # Plane pixels step factor scan voxels; rows reordered from (x, y, z) to (z, y, x)
+        return linear[::-1, :2] * factor, offset[::-1]
+
+    def gather_oblique_plane(self, linear, offset):
+        """Plane read straight from the scan by integer (z, y, x) indices; 0 outside it"""
+        factor = self.oblique_key[-1]
+        width, height = self.sitk_image.GetSize()[:2]
+        columns = np.arange(max(1, width // factor))
+        rows = np.arange(max(1, height // factor))[:, None]
+        indices = linear[:, 0, None, None] * columns + linear[:, 1, None, None] * rows + offset[:, None, None]
+        inside = np.ones(indices.shape[1:], dtype=bool)
+        for index, size in zip(indices, self.scan_array.shape):
+            inside &= (index >= 0) & (index < size)
+        plane = np.zeros(inside.shape, dtype=self.scan_array.dtype)
+        plane[inside] = self.scan_array[tuple(index[inside] for index in indices)]
+        return plane
+
+    def sample_oblique_plane_gpu(self, value):
+        if self.scan_gpu is None:
+            self.scan_gpu = cp.asarray(self.scan_array)  # Uploaded once per scan
+        linear, offset = self.oblique_plane_affine(value)
+        factor = self.oblique_key[-1]
+        width, height = self.sitk_image.GetSize()[:2]
+        columns = cp.arange(max(1, width // factor), dtype=cp.float32)
+        rows = cp.arange(max(1, height // factor), dtype=cp.float32)[:, None]
+        # Only the plane's (3, rows, columns) coordinates are built, never a rotated volume
+        linear, offset = cp.asarray(linear, dtype=cp.float32), cp.asarray(offset, dtype=cp.float32)
+        coordinates = (linear[:, 0, None, None] * columns + linear[:, 1, None, None] * rows
+                       + offset[:, None, None])
+        plane = map_coordinates(self.scan_gpu, coordinates, order=0 if factor > 1 else 1,
+                                mode='constant', cval=0)
+        return plane.get()
+
     def update_oblique_slice(self, value):
-        if hasattr(self, 'oblique_array'):
-            slice_data = self.oblique_array[value, :, :]
-            self.oblique_ax.clear()
+        if self.oblique_key is not None:
+            # Window and repaint only if the volume, slice, window or colormap changed; the
+            # other views' updates call in here on every crosshair or window/level change
+            state = (self.oblique_key, value, self.brightness[0], self.contrast[0], self.current_colormap)
+            if state == getattr(self.oblique_ax, 'display_key', None):
+                return
+
+            if self.oblique_plane_key != (self.oblique_key, value):
+                self.oblique_plane = self.resample_oblique_plane(value)
+                self.oblique_plane_key = (self.oblique_key, value)
+
+            # A preview plane has 1/factor the pixels; its image still spans the full grid
+            width, height = self.sitk_image.GetSize()[:2]
+            slice_data = self.oblique_plane
             angle_x = self.oblique_angle_x_slider.value()
             angle_y = self.oblique_angle_y_slider.value()
             # Oblique view uses the first view's B/C settings
-            self.display_slice(self.oblique_ax, slice_data, f"Oblique View ({angle_x}°, {angle_y}°)", 0)
-            self.oblique_canvas.draw()
+            self.display_slice(self.oblique_ax, slice_data, f"Oblique View ({angle_x}°, {angle_y}°)", 0,
+                               full_shape=(height, width))
+            self.oblique_ax.display_key = state
+            self.oblique_canvas.draw_idle()
 
     def store_roi_bounds(self, view_index, x_min_plot, x_max_plot, y_min_plot, y_max_plot):
-        z_s, y_s, x_s = self.scan_array.shape
-
-        if view_index == 0:  # Axial
-            x_min, x_max = int(x_min_plot), int(x_max_plot)
-            y_min, y_max = int(y_min_plot), int(y_max_plot)
-            z_min, z_max = 0, z_s - 1
-        elif view_index == 1:  # Coronal
-            x_min, x_max = int(x_min_plot), int(x_max_plot)
-            z_min, z_max = z_s - 1 - int(y_max_plot), z_s - 1 - int(y_min_plot)
-            y_min, y_max = 0, y_s - 1
-        elif view_index == 2:  # Sagittal
-            y_min, y_max = int(x_min_plot), int(x_max_plot)
-            z_min, z_max = z_s - 1 - int(y_max_plot), z_s - 1 - int(y_min_plot)
-            x_min, x_max = 0, x_s - 1
-
-        self.roi_bounds_3d = [
-            max(0, z_min), min(z_s - 1, z_max),
-            max(0, y_min), min(y_s - 1, y_max),
-            max(0, x_min), min(x_s - 1, x_max)
-        ]
+        shape = self.scan_array.shape
+        x_axis, y_axis, flipped = ROI_VIEW_AXES[view_index]
+
+        # The axis the view looks along keeps its full range
+        bounds = [(0, n - 1) for n in shape]
+        bounds[x_axis] = (int(x_min_plot), int(x_max_plot))
+        if flipped:
+            top = shape[y_axis] - 1
+            bounds[y_axis] = (top - int(y_max_plot), top - int(y_min_plot))
+        else:
+            bounds[y_axis] = (int(y_min_plot), int(y_max_plot))
+
+        # [z_min, z_max, y_min, y_max, x_min, x_max], clamped to the scan
+        self.roi_bounds_3d = [bound for (low, high), n in zip(bounds, shape)
+                              for bound in (max(0, low), min(n - 1, high))]
 
         self.logger.info(f"ROI bounds set: {self.roi_bounds_3d}")
 
@@ -1303,40 +2159,32 @@ class MRIViewer(QWidget):
 
         z_min, z_max, y_min, y_max, x_min, x_max = self.roi_bounds_3d
 
-        self.axial_slider.setMinimum(z_min)
-        self.axial_slider.setMaximum(z_max)
-        self.coronal_slider.setMinimum(y_min)
-        self.coronal_slider.setMaximum(y_max)
-        self.sagittal_slider.setMinimum(x_min)
-        self.sagittal_slider.setMaximum(x_max)
+        # Narrowing a range clamps the slider's value; keep that from queueing a render per
+        # slider, since the caller redraws all views right after
+        sliders = (self.axial_slider, self.coronal_slider, self.sagittal_slider)
+        for slider, low, high in zip(sliders, (z_min, y_min, x_min), (z_max, y_max, x_max)):
+            slider.blockSignals(True)
+            slider.setRange(low, high)
+            slider.blockSignals(False)
+        self.crosshair_z, self.crosshair_y, self.crosshair_x = (slider.value() for slider in sliders)
 
     def clear_roi(self, reset_bounds=True, *args):
         if reset_bounds:
             self.roi_bounds_3d = None
             if self.scan_array is not None:
-                self.axial_slider.setMinimum(0)
-                self.axial_slider.setMaximum(self.scan_array.shape[0] - 1)
-                self.coronal_slider.setMinimum(0)
-                self.coronal_slider.setMaximum(self.scan_array.shape[1] - 1)
-                self.sagittal_slider.setMinimum(0)
-                self.sagittal_slider.setMaximum(self.scan_array.shape[2] - 1)
+                # A smaller scan clamps the sliders; their throttled valueChanged would sync the
+                # crosshairs too late for the redraw below, so read the clamped values back
+                sliders = (self.axial_slider, self.coronal_slider, self.sagittal_slider)
+                for slider, size in zip(sliders, self.scan_array.shape):
+                    slider.blockSignals(True)
+                    slider.setRange(0, size - 1)
+                    slider.blockSignals(False)
+                self.crosshair_z, self.crosshair_y, self.crosshair_x = (slider.value() for slider in sliders)
 
         for ax in [self.axial_ax, self.coronal_ax, self.sagittal_ax]:
-            if hasattr(ax, 'roi_patch'):
-                patch = ax.roi_patch
-                try:
-                    # Check if patch is still in the axes
-                    if patch in ax.patches:
-                        patch.remove()
-                except (ValueError, NotImplementedError, AttributeError) as e:
-                    # If removal fails, try to make it invisible instead
-                    try:
-                        patch.set_visible(False)
-                    except:
-                        pass
-                finally:
-                    # Always delete the attribute
-                    delattr(ax, 'roi_patch')
+            # Hide any rubber band; the rectangle is kept for the next drag
+            if getattr(ax, 'roi_patch', None) is not None:
+                ax.roi_patch.set_visible(False)
 
         self.update_all_slices()
         self.status_bar.showMessage("✓ ROI cleared", 3000)
@@ -1346,23 +2194,19 @@ class MRIViewer(QWidget):
             QMessageBox.warning(self, "No ROI", "Please draw an ROI before saving.")
             return
 
-        z_min, z_max, y_min, y_max, x_min, x_max = self.roi_bounds_3d
-        roi_array = self.scan_array[z_min:z_max + 1, y_min:y_max + 1, x_min:x_max + 1]
-
-        new_sitk_image = sitk.GetImageFromArray(roi_array)
-        new_sitk_image.SetSpacing(self.sitk_image.GetSpacing())
-        new_sitk_image.SetDirection(self.sitk_image.GetDirection())
-
-        new_origin_physical = self.sitk_image.TransformIndexToPhysicalPoint(
-            (int(x_min), int(y_min), int(z_min))
-        )
-        new_sitk_image.SetOrigin(new_origin_physical)
-
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save ROI Volume", "", "NIfTI files (*.nii.gz)"
         )
 
         if file_path:
+            z_min, z_max, y_min, y_max, x_min, x_max = self.roi_bounds_3d
+            # Cropped straight from the SimpleITK buffer, keeping spacing, direction and
+            # the physical origin of the ROI corner
+            new_sitk_image = sitk.RegionOfInterest(
+                self.sitk_image,
+                [x_max - x_min + 1, y_max - y_min + 1, z_max - z_min + 1],
+                [int(x_min), int(y_min), int(z_min)]
+            )
             sitk.WriteImage(new_sitk_image, file_path)
             self.status_bar.showMessage(
                 f"✓ ROI saved to {os.path.basename(file_path)}", 5000
@@ -1388,26 +2232,19 @@ class MRIViewer(QWidget):
         if not self.is_playing:
             return
 
-        # Advance Axial Slider
-        current_axial = self.axial_slider.value()
-        if current_axial < self.axial_slider.maximum():
-            self.axial_slider.setValue(current_axial + 1)
-        else:
-            self.axial_slider.setValue(self.axial_slider.minimum())
-
-        # Advance Coronal Slider
-        current_coronal = self.coronal_slider.value()
-        if current_coronal < self.coronal_slider.maximum():
-            self.coronal_slider.setValue(current_coronal + 1)
-        else:
-            self.coronal_slider.setValue(self.coronal_slider.minimum())
+        # Advance all three sliders silently, then render the new frame once
+        sliders = (self.axial_slider, self.coronal_slider, self.sagittal_slider)
+        for slider in sliders:
+            slider.blockSignals(True)
+            current = slider.value()
+            if current < slider.maximum():
+                slider.setValue(current + 1)
+            else:
+                slider.setValue(slider.minimum())
+            slider.blockSignals(False)
 
-        # Advance Sagittal Slider
-        current_sagittal = self.sagittal_slider.value()
-        if current_sagittal < self.sagittal_slider.maximum():
-            self.sagittal_slider.setValue(current_sagittal + 1)
-        else:
-            self.sagittal_slider.setValue(self.sagittal_slider.minimum())
+        self.crosshair_z, self.crosshair_y, self.crosshair_x = (s.value() for s in sliders)
+        self.update_all_slices()
 
     def reset_view(self, *args):
         if self.scan_array is not None:
@@ -1439,28 +2276,23 @@ class MRIViewer(QWidget):
 
         ax.set_xlim(new_x_min, new_x_max)
         ax.set_ylim(new_y_min, new_y_max)
-        ax.figure.canvas.draw_idle()
+        self.request_redraw(ax)
 
     def keyPressEvent(self, event):
         step = 10
-        if event.key() == Qt.Key_Left:
-            self.pan_view(-step, 0)
-        elif event.key() == Qt.Key_Right:
-            self.pan_view(step, 0)
-        elif event.key() == Qt.Key_Up:
-            self.pan_view(0, -step)
-        elif event.key() == Qt.Key_Down:
-            self.pan_view(0, step)
+        direction = PAN_KEYS.get(event.key())
+        if direction is not None:
+            self.pan_view(direction[0] * step, direction[1] * step)
 
-    def pan_view(self, dx, dy):
-        active_canvas = QApplication.instance().widgetAt(QCursor.pos())
+    def on_canvas_leave(self, view_index):
+        # Enter/leave of neighbouring canvases can arrive in either order
+        if self.hovered_view == view_index:
+            self.hovered_view = None
 
-        if active_canvas == self.axial_canvas:
-            self.pan_specific_view(self.axial_ax, dx, dy)
-        elif active_canvas == self.coronal_canvas:
-            self.pan_specific_view(self.coronal_ax, dx, dy)
-        elif active_canvas == self.sagittal_canvas:
-            self.pan_specific_view(self.sagittal_ax, dx, dy)
+    def pan_view(self, dx, dy):
+        # Pan the view under the mouse, tracked by enter/leave events rather than a widget lookup
+        if self.hovered_view is not None:
+            self.pan_specific_view((self.axial_ax, self.coronal_ax, self.sagittal_ax)[self.hovered_view], dx, dy)
 
     def pan_specific_view(self, ax, dx, dy):
         x_min, x_max = ax.get_xlim()
@@ -1468,7 +2300,7 @@ class MRIViewer(QWidget):
 
         ax.set_xlim(x_min + dx, x_max + dx)
         ax.set_ylim(y_min + dy, y_max + dy)
-        ax.figure.canvas.draw_idle()
+        self.request_redraw(ax)
 
     # ========================================================================
     # MAIN ORGAN DETECTION METHOD
@@ -3,132 +3,204 @@ Organ Detection Module for MRI/CT Viewer
 Detects body parts and organs from DICOM metadata
 """
 
+import os
 import pydicom
 import logging
+import functools
+import itertools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional, Dict
 import re
 
+try:
+    import ahocorasick  # optional: pyahocorasick keyword automaton
+except ImportError:
+    ahocorasick = None
+
+
+# Every tag detect_organ looks at; read with specific_tags so nothing else is parsed
+_HEADER_TAGS = [
+    'PatientName', 'PatientID', 'PatientSex', 'PatientAge',
+    'StudyDate', 'StudyDescription', 'SeriesDescription', 'BodyPartExamined',
+    'Modality', 'Manufacturer', 'StationName',
+    'ProtocolName', 'SequenceName',
+]
+
+
+def _read_header(path: str) -> Optional[pydicom.Dataset]:
+    """Header-only read of the tags in _HEADER_TAGS; None if the file can't be parsed"""
+    try:
+        return pydicom.dcmread(path, stop_before_pixels=True, specific_tags=_HEADER_TAGS)
+    except Exception as e:
+        logging.warning(f"Skipping unreadable DICOM {path}: {e}")
+        return None
+
+
+def _alternation(keys) -> "re.Pattern":
+    """Compile keys, in order, into one zero-width alternation: finditer then yields, at every
+    position of the text, the earliest key that occurs there (overlapping keys included)"""
+    return re.compile('(?=(' + '|'.join(re.escape(k) for k in keys) + '))')
+
+
+def _first_key(pattern: "re.Pattern", rank: Dict[str, int], text: str) -> Optional[str]:
+    """Of the keys occurring in text, the one earliest in its mapping (the order the
+    original per-key loop tried them in), found in one scan of the text"""
+    return min((m.group(1) for m in pattern.finditer(text)), key=rank.__getitem__, default=None)
+
+
+# Comprehensive mapping of DICOM body part codes to organ names
+BODY_PART_MAPPING = {
+    # Head and Brain
+    'BRAIN': ('Brain', '🧠'),
+    'HEAD': ('Head/Brain', '🧠'),
+    'SKULL': ('Skull', '💀'),
+    'CSKULL': ('Skull', '💀'),
+    'SINUS': ('Sinuses', '👃'),
+    'ORBIT': ('Orbit/Eye', '👁️'),
+    'EYE': ('Eye', '👁️'),
+    'EAR': ('Ear', '👂'),
+    'FACE': ('Face', '😊'),
+    'JAW': ('Jaw', '🦷'),
+    'TMJOINT': ('TMJ Joint', '🦷'),
+
+    # Spine
+    'CSPINE': ('Cervical Spine', '🦴'),
+    'TSPINE': ('Thoracic Spine', '🦴'),
+    'LSPINE': ('Lumbar Spine', '🦴'),
+    'SSPINE': ('Sacral Spine', '🦴'),
+    'SPINE': ('Spine', '🦴'),
+    'WHOLESPINE': ('Whole Spine', '🦴'),
+
+    # Thorax
+    'CHEST': ('Chest', '🫁'),
+    'THORAX': ('Thorax', '🫁'),
+    'LUNG': ('Lung', '🫁'),
+    'HEART': ('Heart', '❤️'),
+    'CLAVICLE': ('Clavicle', '🦴'),
+    'RIB': ('Ribs', '🦴'),
+    'STERNUM': ('Sternum', '🦴'),
+    'MEDIASTINUM': ('Mediastinum', '🫁'),
+
+    # Abdomen
+    'ABDOMEN': ('Abdomen', '🔶'),
+    'LIVER': ('Liver', '🟤'),
+    'KIDNEY': ('Kidney', '🫘'),
+    'SPLEEN': ('Spleen', '🟣'),
+    'PANCREAS': ('Pancreas', '🟡'),
+    'GALLBLADDER': ('Gallbladder', '🟢'),
+    'STOMACH': ('Stomach', '🔴'),
+    'BOWEL': ('Bowel', '🟠'),
+    'COLON': ('Colon', '🟠'),
+
+    # Pelvis
+    'PELVIS': ('Pelvis', '🦴'),
+    'HIP': ('Hip', '🦴'),
+    'PROSTATE': ('Prostate', '🔵'),
+    'UTERUS': ('Uterus', '🟣'),
+    'OVARY': ('Ovary', '🟣'),
+    'BLADDER': ('Bladder', '🔵'),
+
+    # Extremities
+    'SHOULDER': ('Shoulder', '💪'),
+    'HUMERUS': ('Humerus', '🦴'),
+    'ELBOW': ('Elbow', '🦴'),
+    'FOREARM': ('Forearm', '💪'),
+    'WRIST': ('Wrist', '✋'),
+    'HAND': ('Hand', '✋'),
+    'FINGER': ('Finger', '👆'),
+    'THUMB': ('Thumb', '👍'),
+
+    'FEMUR': ('Femur', '🦴'),
+    'KNEE': ('Knee', '🦵'),
+    'TIBIA': ('Tibia', '🦴'),
+    'FIBULA': ('Fibula', '🦴'),
+    'ANKLE': ('Ankle', '🦶'),
+    'FOOT': ('Foot', '🦶'),
+    'TOE': ('Toe', '🦶'),
+
+    # Neck and Throat
+    'NECK': ('Neck', '🦒'),
+    'THYROID': ('Thyroid', '🦋'),
+    'LARYNX': ('Larynx', '🗣️'),
+    'PHARYNX': ('Pharynx', '🗣️'),
+
+    # Vascular
+    'AORTA': ('Aorta', '❤️'),
+    'CAROTID': ('Carotid Artery', '❤️'),
+    'VESSEL': ('Blood Vessel', '❤️'),
+
+    # Other
+    'BREAST': ('Breast', '👙'),
+    'ADRENAL': ('Adrenal Gland', '🟡'),
+}
+
+# Series description keywords for organ detection
+SERIES_KEYWORDS = {
+    'brain': ('Brain', '🧠'),
+    'head': ('Head/Brain', '🧠'),
+    'cerebr': ('Brain', '🧠'),
+    'cardiac': ('Heart', '❤️'),
+    'heart': ('Heart', '❤️'),
+    'liver': ('Liver', '🟤'),
+    'hepat': ('Liver', '🟤'),
+    'renal': ('Kidney', '🫘'),
+    'kidney': ('Kidney', '🫘'),
+    'lung': ('Lung', '🫁'),
+    'pulmon': ('Lung', '🫁'),
+    'spine': ('Spine', '🦴'),
+    'vertebr': ('Spine', '🦴'),
+    'pelv': ('Pelvis', '🦴'),
+    'abdom': ('Abdomen', '🔶'),
+    'chest': ('Chest', '🫁'),
+    'thorax': ('Thorax', '🫁'),
+    'knee': ('Knee', '🦵'),
+    'shoulder': ('Shoulder', '💪'),
+    'hip': ('Hip', '🦴'),
+    'hand': ('Hand', '✋'),
+    'wrist': ('Wrist', '✋'),
+    'foot': ('Foot', '🦶'),
+    'ankle': ('Ankle', '🦶'),
+    'elbow': ('Elbow', '🦴'),
+    'prostat': ('Prostate', '🔵'),
+    'breast': ('Breast', '👙'),
+    'mamm': ('Breast', '👙'),
+}
+
+
+# One C-level scan per description instead of a Python `in` test per key. When several
+# keys match, the one earliest in the mapping wins, as it did with the per-key loop
+_BODY_PART_REGEX = _alternation(BODY_PART_MAPPING)
+_SERIES_KEYWORD_REGEX = _alternation(SERIES_KEYWORDS)
+_BODY_PART_RANK = {key: rank for rank, key in enumerate(BODY_PART_MAPPING)}
+_SERIES_KEYWORD_RANK = {key: rank for rank, key in enumerate(SERIES_KEYWORDS)}
+
+# With pyahocorasick, description keywords are found in one pass over the text
+# regardless of how many keywords there are; otherwise the regex above is used
+if ahocorasick is not None:
+    _SERIES_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _rank in _SERIES_KEYWORD_RANK.items():
+        _SERIES_AUTOMATON.add_word(_keyword, (_rank, _keyword))
+    _SERIES_AUTOMATON.make_automaton()
+else:
+    _SERIES_AUTOMATON = None
+
+
+def _match_series_keyword(text: str) -> Optional[Tuple[str, str]]:
+    """(organ, emoji) of the earliest SERIES_KEYWORDS key found in lower-cased text, or None"""
+    if _SERIES_AUTOMATON is not None:
+        hit = min((hit for _, hit in _SERIES_AUTOMATON.iter(text)), default=None)
+        return SERIES_KEYWORDS[hit[1]] if hit else None
+    key = _first_key(_SERIES_KEYWORD_REGEX, _SERIES_KEYWORD_RANK, text)
+    return SERIES_KEYWORDS[key] if key else None
+
 
 class OrganDetector:
     """Detects organs and body parts from DICOM metadata"""
 
-    # Comprehensive mapping of DICOM body part codes to organ names
-    BODY_PART_MAPPING = {
-        # Head and Brain
-        'BRAIN': ('Brain', '🧠'),
-        'HEAD': ('Head/Brain', '🧠'),
-        'SKULL': ('Skull', '💀'),
-        'CSKULL': ('Skull', '💀'),
-        'SINUS': ('Sinuses', '👃'),
-        'ORBIT': ('Orbit/Eye', '👁️'),
-        'EYE': ('Eye', '👁️'),
-        'EAR': ('Ear', '👂'),
-        'FACE': ('Face', '😊'),
-        'JAW': ('Jaw', '🦷'),
-        'TMJOINT': ('TMJ Joint', '🦷'),
-
-        # Spine
-        'CSPINE': ('Cervical Spine', '🦴'),
-        'TSPINE': ('Thoracic Spine', '🦴'),
-        'LSPINE': ('Lumbar Spine', '🦴'),
-        'SSPINE': ('Sacral Spine', '🦴'),
-        'SPINE': ('Spine', '🦴'),
-        'WHOLESPINE': ('Whole Spine', '🦴'),
-
-        # Thorax
-        'CHEST': ('Chest', '🫁'),
-        'THORAX': ('Thorax', '🫁'),
-        'LUNG': ('Lung', '🫁'),
-        'HEART': ('Heart', '❤️'),
-        'CLAVICLE': ('Clavicle', '🦴'),
-        'RIB': ('Ribs', '🦴'),
-        'STERNUM': ('Sternum', '🦴'),
-        'MEDIASTINUM': ('Mediastinum', '🫁'),
-
-        # Abdomen
-        'ABDOMEN': ('Abdomen', '🔶'),
-        'LIVER': ('Liver', '🟤'),
-        'KIDNEY': ('Kidney', '🫘'),
-        'SPLEEN': ('Spleen', '🟣'),
-        'PANCREAS': ('Pancreas', '🟡'),
-        'GALLBLADDER': ('Gallbladder', '🟢'),
-        'STOMACH': ('Stomach', '🔴'),
-        'BOWEL': ('Bowel', '🟠'),
-        'COLON': ('Colon', '🟠'),
-
-        # Pelvis
-        'PELVIS': ('Pelvis', '🦴'),
-        'HIP': ('Hip', '🦴'),
-        'PROSTATE': ('Prostate', '🔵'),
-        'UTERUS': ('Uterus', '🟣'),
-        'OVARY': ('Ovary', '🟣'),
-        'BLADDER': ('Bladder', '🔵'),
-
-        # Extremities
-        'SHOULDER': ('Shoulder', '💪'),
-        'HUMERUS': ('Humerus', '🦴'),
-        'ELBOW': ('Elbow', '🦴'),
-        'FOREARM': ('Forearm', '💪'),
-        'WRIST': ('Wrist', '✋'),
-        'HAND': ('Hand', '✋'),
-        'FINGER': ('Finger', '👆'),
-        'THUMB': ('Thumb', '👍'),
-
-        'FEMUR': ('Femur', '🦴'),
-        'KNEE': ('Knee', '🦵'),
-        'TIBIA': ('Tibia', '🦴'),
-        'FIBULA': ('Fibula', '🦴'),
-        'ANKLE': ('Ankle', '🦶'),
-        'FOOT': ('Foot', '🦶'),
-        'TOE': ('Toe', '🦶'),
-
-        # Neck and Throat
-        'NECK': ('Neck', '🦒'),
-        'THYROID': ('Thyroid', '🦋'),
-        'LARYNX': ('Larynx', '🗣️'),
-        'PHARYNX': ('Pharynx', '🗣️'),
-
-        # Vascular
-        'AORTA': ('Aorta', '❤️'),
-        'CAROTID': ('Carotid Artery', '❤️'),
-        'VESSEL': ('Blood Vessel', '❤️'),
-
-        # Other
-        'BREAST': ('Breast', '👙'),
-        'ADRENAL': ('Adrenal Gland', '🟡'),
-    }
-
-    # Series description keywords for organ detection
-    SERIES_KEYWORDS = {
-        'brain': ('Brain', '🧠'),
-        'head': ('Head/Brain', '🧠'),
-        'cerebr': ('Brain', '🧠'),
-        'cardiac': ('Heart', '❤️'),
-        'heart': ('Heart', '❤️'),
-        'liver': ('Liver', '🟤'),
-        'hepat': ('Liver', '🟤'),
-        'renal': ('Kidney', '🫘'),
-        'kidney': ('Kidney', '🫘'),
-        'lung': ('Lung', '🫁'),
-        'pulmon': ('Lung', '🫁'),
-        'spine': ('Spine', '🦴'),
-        'vertebr': ('Spine', '🦴'),
-        'pelv': ('Pelvis', '🦴'),
-        'abdom': ('Abdomen', '🔶'),
-        'chest': ('Chest', '🫁'),
-        'thorax': ('Thorax', '🫁'),
-        'knee': ('Knee', '🦵'),
-        'shoulder': ('Shoulder', '💪'),
-        'hip': ('Hip', '🦴'),
-        'hand': ('Hand', '✋'),
-        'wrist': ('Wrist', '✋'),
-        'foot': ('Foot', '🦶'),
-        'ankle': ('Ankle', '🦶'),
-        'elbow': ('Elbow', '🦴'),
-        'prostat': ('Prostate', '🔵'),
-        'breast': ('Breast', '👙'),
-        'mamm': ('Breast', '👙'),
-    }
+    # Kept as class attributes for existing callers; the module-level dicts are the source
+    BODY_PART_MAPPING = BODY_PART_MAPPING
+    SERIES_KEYWORDS = SERIES_KEYWORDS
 
     @staticmethod
     def detect_organ(dicom_path: str) -> Tuple[str, str, float, Dict[str, str]]:
@@ -142,33 +214,90 @@ class OrganDetector:
             Tuple of (organ_name, emoji, confidence, metadata_dict)
         """
         try:
-            ds = pydicom.dcmread(dicom_path)
+            # Header only; the organ comes from three text tags, never from pixels
+            ds = pydicom.dcmread(dicom_path, stop_before_pixels=True, specific_tags=_HEADER_TAGS)
             metadata = OrganDetector._extract_metadata(ds)
+            organ, emoji, confidence = OrganDetector._classify(ds)
+            return organ, emoji, confidence, metadata
 
-            # Try multiple detection methods
-            organ, emoji, confidence = OrganDetector._detect_from_body_part(ds)
-            if confidence < 0.8:
-                organ2, emoji2, conf2 = OrganDetector._detect_from_series_description(ds)
-                if conf2 > confidence:
-                    organ, emoji, confidence = organ2, emoji2, conf2
+        except Exception as e:
+            logging.error(f"Error detecting organ: {e}")
+            return "Unknown", "❓", 0.0, {}
 
-            if confidence < 0.6:
-                organ3, emoji3, conf3 = OrganDetector._detect_from_study_description(ds)
-                if conf3 > confidence:
-                    organ, emoji, confidence = organ3, emoji3, conf3
+    @classmethod
+    def detect_organ_series(cls, folder: str) -> Tuple[str, str, float, Dict[str, str]]:
+        """
+        Detect organ for a whole folder of DICOM files at once
 
-            # Add anatomical region info
-            if confidence < 0.5:
-                organ = "Unknown Region"
-                emoji = "❓"
-                confidence = 0.3
+        Headers are read in parallel (I/O bound, so threads overlap the reads) and
+        the per-file decisions are majority-voted into one answer for the series.
 
-            return organ, emoji, confidence, metadata
+        Args:
+            folder: Directory containing the series' .dcm files
 
-        except Exception as e:
-            logging.error(f"Error detecting organ: {e}")
+        Returns:
+            Tuple of (organ_name, emoji, confidence, metadata_dict); metadata is
+            taken from the first file that voted for the winning organ
+        """
+        with os.scandir(folder) as it:
+            paths = [e.path for e in it if e.is_file() and e.name.lower().endswith('.dcm')]
+
+        with ThreadPoolExecutor() as ex:
+            datasets = list(ex.map(_read_header, paths))
+
+        votes = Counter()
+        first_ds = {}
+        for ds in datasets:
+            if ds is None:
+                continue
+            result = cls._classify(ds)
+            votes[result] += 1
+            first_ds.setdefault(result, ds)
+
+        if not votes:
+            logging.error(f"No readable DICOM files in: {folder}")
             return "Unknown", "❓", 0.0, {}
 
+        (organ, emoji, confidence), _ = votes.most_common(1)[0]
+        return organ, emoji, confidence, cls._extract_metadata(first_ds[(organ, emoji, confidence)])
+
+    @staticmethod
+    def _classify(ds: pydicom.Dataset) -> Tuple[str, str, float]:
+        """Organ decision for one header, via the per-tag-set cache"""
+        # Normalize each tag exactly once here; the detectors take the strings as-is
+        return OrganDetector._detect_organ_cached(
+            str(getattr(ds, 'BodyPartExamined', '')).upper().strip(),
+            str(getattr(ds, 'SeriesDescription', '')).lower(),
+            str(getattr(ds, 'StudyDescription', '')).lower())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _detect_organ_cached(body_part: str, series_desc: str,
+                             study_desc: str) -> Tuple[str, str, float]:
+        """
+        Organ decision for one set of normalized description tags ('' = tag absent).
+        Every file of a series carries the same tags, so only the first one is scanned.
+        """
+        # Try multiple detection methods
+        organ, emoji, confidence = OrganDetector._detect_from_body_part(body_part)
+        if confidence < 0.8:
+            organ2, emoji2, conf2 = OrganDetector._detect_from_series_description(series_desc)
+            if conf2 > confidence:
+                organ, emoji, confidence = organ2, emoji2, conf2
+
+        if confidence < 0.6:
+            organ3, emoji3, conf3 = OrganDetector._detect_from_study_description(study_desc)
+            if conf3 > confidence:
+                organ, emoji, confidence = organ3, emoji3, conf3
+
+        # Add anatomical region info
+        if confidence < 0.5:
+            organ = "Unknown Region"
+            emoji = "❓"
+            confidence = 0.3
+
+        return organ, emoji, confidence
+
     @staticmethod
     def _extract_metadata(ds: pydicom.Dataset) -> Dict[str, str]:
         """Extract relevant metadata from DICOM"""
@@ -198,50 +327,55 @@ class OrganDetector:
         return metadata
 
     @staticmethod
-    def _detect_from_body_part(ds: pydicom.Dataset) -> Tuple[str, str, float]:
-        """Detect organ from BodyPartExamined tag"""
-        if not hasattr(ds, 'BodyPartExamined'):
+    def _detect_from_body_part(body_part: str) -> Tuple[str, str, float]:
+        """Detect organ from the upper-cased, stripped BodyPartExamined tag"""
+        if not body_part:
             return "Unknown", "❓", 0.0
 
-        body_part = str(ds.BodyPartExamined).upper().strip()
+        mapping = BODY_PART_MAPPING
 
         # Direct match
-        if body_part in OrganDetector.BODY_PART_MAPPING:
-            organ, emoji = OrganDetector.BODY_PART_MAPPING[body_part]
+        if body_part in mapping:
+            organ, emoji = mapping[body_part]
             return organ, emoji, 0.95
 
-        # Partial match
-        for key, (organ, emoji) in OrganDetector.BODY_PART_MAPPING.items():
-            if key in body_part or body_part in key:
-                return organ, emoji, 0.85
+        # Partial match: the earliest key in the mapping that is inside the tag value...
+        key = _first_key(_BODY_PART_REGEX, _BODY_PART_RANK, body_part)
+        # ...unless an earlier key contains the tag value
+        limit = _BODY_PART_RANK[key] if key else len(mapping)
+        for candidate in itertools.islice(mapping, limit):
+            if body_part in candidate:
+                key = candidate
+                break
+        if key:
+            organ, emoji = mapping[key]
+            return organ, emoji, 0.85
 
         return body_part.title(), "🔍", 0.5
 
     @staticmethod
-    def _detect_from_series_description(ds: pydicom.Dataset) -> Tuple[str, str, float]:
-        """Detect organ from SeriesDescription"""
-        if not hasattr(ds, 'SeriesDescription'):
+    def _detect_from_series_description(series_desc: str) -> Tuple[str, str, float]:
+        """Detect organ from the lower-cased SeriesDescription"""
+        if not series_desc:
             return "Unknown", "❓", 0.0
 
-        series_desc = str(ds.SeriesDescription).lower()
-
-        for keyword, (organ, emoji) in OrganDetector.SERIES_KEYWORDS.items():
-            if keyword in series_desc:
-                return organ, emoji, 0.75
+        hit = _match_series_keyword(series_desc)
+        if hit:
+            organ, emoji = hit
+            return organ, emoji, 0.75
 
         return "Unknown", "❓", 0.0
 
     @staticmethod
-    def _detect_from_study_description(ds: pydicom.Dataset) -> Tuple[str, str, float]:
-        """Detect organ from StudyDescription"""
-        if not hasattr(ds, 'StudyDescription'):
+    def _detect_from_study_description(study_desc: str) -> Tuple[str, str, float]:
+        """Detect organ from the lower-cased StudyDescription"""
+        if not study_desc:
             return "Unknown", "❓", 0.0
 
-        study_desc = str(ds.StudyDescription).lower()
-
-        for keyword, (organ, emoji) in OrganDetector.SERIES_KEYWORDS.items():
-            if keyword in study_desc:
-                return organ, emoji, 0.65
+        hit = _match_series_keyword(study_desc)
+        if hit:
+            organ, emoji = hit
+            return organ, emoji, 0.65
 
         return "Unknown", "❓", 0.0
 
@@ -272,10 +406,26 @@ if __name__ == "__main__":
     # Test with a sample DICOM file
     import sys
 
+    if '--self-check' in sys.argv:
+        # Keyword precedence must match the original per-key loops (mapping order)
+        checks = [
+            (OrganDetector._detect_from_series_description("chest abdomen pelvis"), "Pelvis"),
+            (OrganDetector._detect_from_series_description("head brain"), "Brain"),
+            (OrganDetector._detect_from_body_part("ABDOMEN CHEST"), "Chest"),
+            (OrganDetector._detect_from_body_part("SPIN"), "Cervical Spine"),
+        ]
+        for (organ, _, _), expected in checks:
+            assert organ == expected, f"detected {organ}, expected {expected}"
+        print(f"All {len(checks)} keyword precedence checks passed")
+        sys.exit(0)
+
     if len(sys.argv) > 1:
         dicom_path = sys.argv[1]
-        organ, emoji, confidence, metadata = OrganDetector.detect_organ(dicom_path)
+        if os.path.isdir(dicom_path):
+            organ, emoji, confidence, metadata = OrganDetector.detect_organ_series(dicom_path)
+        else:
+            organ, emoji, confidence, metadata = OrganDetector.detect_organ(dicom_path)
         report = OrganDetector.format_detection_report(organ, emoji, confidence, metadata)
         print(report)
     else:
-        print("Usage: python organ_detector.py <dicom_file_path>")
\ No newline at end of file
+        print("Usage: python organ_detector.py <dicom_file_path | dicom_folder>")
\ No newline at end of file